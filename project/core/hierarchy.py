@@ -0,0 +1,76 @@
+"""
+Snapshot of competition tree with stages, distances and insurances.
+Snapshot is built with three queries and kept in process memory. Snapshot is dropped when any Competition,
+Distance or Insurance is saved or deleted.
+"""
+from core.snapshots import VersionedSnapshot
+
+
+class CompetitionHierarchy(object):
+    def __init__(self):
+        from core.models import Competition, Distance, Insurance
+
+        self.competitions = {}
+        self.children = {}  # competition_id: [child competition ids in tree order]
+        for competition in Competition.objects.order_by('tree_id', 'lft'):
+            self.competitions[competition.id] = competition
+            self.children.setdefault(competition.id, [])
+            if competition.parent_id:
+                self.children.setdefault(competition.parent_id, []).append(competition.id)
+
+        self.stage_index = {}
+        for child_ids in self.children.values():
+            for index, child_id in enumerate(child_ids, start=1):
+                self.stage_index[child_id] = index
+
+        all_distances = list(Distance.objects.all())
+        all_insurances = list(Insurance.objects.all())
+        self.distances = {}
+        self.insurances = {}
+        for competition in self.competitions.values():
+            ids = competition.get_ids()
+            self.distances[competition.id] = [obj for obj in all_distances if obj.competition_id in ids]
+            insurances = [obj for obj in all_insurances if obj.competition_id in ids]
+            if competition.level == 1 and competition.tree_id == 1:
+                insurances = [obj for obj in insurances if obj.in_complex]
+            self.insurances[competition.id] = insurances
+
+        for obj in all_distances + all_insurances:
+            obj.competition = self.competitions.get(obj.competition_id)
+
+    def __contains__(self, competition_id):
+        return competition_id in self.competitions
+
+    def get_parent(self, competition_id):
+        return self.competitions.get(self.competitions[competition_id].parent_id)
+
+    def get_stages(self, competition_id):
+        return [self.competitions[child_id] for child_id in self.children[competition_id]]
+
+    def get_all_children_ids(self, competition_id):
+        competition = self.competitions[competition_id]
+        if competition.level == 2:
+            return tuple(self.children[competition.parent_id])
+        elif competition.tree_id == 1:
+            return tuple(self.children[competition_id])
+        else:
+            return (competition_id, )
+
+
+_hierarchy = VersionedSnapshot('competition_hierarchy', CompetitionHierarchy)
+
+
+def get_hierarchy():
+    return _hierarchy.get()
+
+
+def get_hierarchy_version():
+    """
+    Version of hierarchy snapshot. It changes in all processes after any Competition, Distance or Insurance change.
+    """
+    _hierarchy.get()
+    return _hierarchy.version
+
+
+def invalidate_hierarchy(sender=None, **kwargs):
+    _hierarchy.invalidate()
@@ -1,5 +1,6 @@
 import datetime
 from django.db import models
+from django.db.models import signals
 from django.utils.http import urlquote
 import time
 from django.template.defaultfilters import slugify
@@ -11,6 +12,9 @@ from django.core.mail import send_mail
 from legacy.models import Ev68RSession
 from marketing.models import MailgunEmail
 from velo.mixins.models import TimestampMixin, StatusMixin, CustomTrackChanges
+from core.hierarchy import get_hierarchy, invalidate_hierarchy
+from core.processing import invalidate_processing_classes
+from core.slugs import invalidate_custom_slugs
 from django.contrib.auth.models import AbstractUser, PermissionsMixin, AbstractBaseUser, UserManager
 from django_countries.fields import CountryField
 from django.contrib.contenttypes.models import ContentType
@@ -218,6 +222,10 @@ class Competition(MPTTModel):
             return (self.id, )
 
     def get_all_children_ids(self):
+        hierarchy = get_hierarchy()
+        if self.id in hierarchy:
+            return hierarchy.get_all_children_ids(self.id)
+
         if self.level == 2:
             return tuple(obj.id for obj in Competition.objects.filter(parent_id=self.parent_id))
         elif self.tree_id == 1:
@@ -234,10 +242,48 @@ class Competition(MPTTModel):
             insurances = insurances.filter(in_complex=True)
         return insurances.select_related('competition')
 
+    def get_stages(self):
+        """
+        Returns list of child competitions from hierarchy snapshot.
+        """
+        hierarchy = get_hierarchy()
+        if self.id in hierarchy:
+            return hierarchy.get_stages(self.id)
+        return list(self.get_children())
+
+    def get_stage_index(self):
+        """
+        Returns stage number starting from 1 among parent children.
+        """
+        hierarchy = get_hierarchy()
+        if self.id in hierarchy:
+            return hierarchy.stage_index.get(self.id)
+        return [obj.id for obj in self.parent.get_children()].index(self.id) + 1
+
+    def get_distance_list(self):
+        """
+        The same as get_distances, but returns list from hierarchy snapshot.
+        """
+        hierarchy = get_hierarchy()
+        if self.id in hierarchy:
+            return hierarchy.distances[self.id]
+        return list(self.get_distances())
+
+    def get_insurance_list(self):
+        """
+        The same as get_insurances, but returns list from hierarchy snapshot.
+        """
+        hierarchy = get_hierarchy()
+        if self.id in hierarchy:
+            return hierarchy.insurances[self.id]
+        return list(self.get_insurances())
+
     @property
     def get_full_name(self):
         if self.level == 2:
-            return '%s - %s' % (self.parent.name, self.name)
+            hierarchy = get_hierarchy()
+            parent = hierarchy.get_parent(self.id) if self.id in hierarchy else self.parent
+            return '%s - %s' % (parent.name, self.name)
         else:
             return self.name
 
@@ -258,6 +304,20 @@ class Competition(MPTTModel):
         return self.name
 
 
+signals.post_save.connect(invalidate_processing_classes, sender=Competition)
+signals.post_delete.connect(invalidate_processing_classes, sender=Competition)
+
+
+def invalidate_competition_tariffs(sender, instance, **kwargs):
+    from payment.tariffs import invalidate_tariff_index
+    invalidate_tariff_index(instance if sender is Competition else instance.competition)
+
+signals.post_save.connect(invalidate_competition_tariffs, sender=Competition)
+signals.post_delete.connect(invalidate_competition_tariffs, sender=Competition)
+signals.post_save.connect(invalidate_hierarchy, sender=Competition)
+signals.post_delete.connect(invalidate_hierarchy, sender=Competition)
+
+
 class Distance(TimestampMixin, models.Model):
     competition = models.ForeignKey('core.Competition')
     name = models.CharField(max_length=100)
@@ -280,6 +340,10 @@ class Distance(TimestampMixin, models.Model):
         order_with_respect_to = 'competition'
 
 
+signals.post_save.connect(invalidate_hierarchy, sender=Distance)
+signals.post_delete.connect(invalidate_hierarchy, sender=Distance)
+
+
 class InsuranceCompany(models.Model):
     name = models.CharField(max_length=50)
     term = models.TextField(blank=True)
@@ -303,6 +367,12 @@ class Insurance(StatusMixin, models.Model):
         ordering = ('competition', 'price', )
 
 
+signals.post_save.connect(invalidate_competition_tariffs, sender=Insurance)
+signals.post_delete.connect(invalidate_competition_tariffs, sender=Insurance)
+signals.post_save.connect(invalidate_hierarchy, sender=Insurance)
+signals.post_delete.connect(invalidate_hierarchy, sender=Insurance)
+
+
 class CustomSlug(models.Model):
     first_name = models.CharField(max_length=60)
     last_name = models.CharField(max_length=60)
@@ -310,6 +380,10 @@ class CustomSlug(models.Model):
     slug = models.SlugField(blank=True)
 
 
+signals.post_save.connect(invalidate_custom_slugs, sender=CustomSlug)
+signals.post_delete.connect(invalidate_custom_slugs, sender=CustomSlug)
+
+
 class Log(models.Model):
     content_type = models.ForeignKey(ContentType, null=True, blank=True)
     object_id = models.PositiveIntegerField(null=True, blank=True)
@@ -3,6 +3,7 @@
 #history http://www.reportlab.co.uk/cgi-bin/viewcvs.cgi/public/reportlab/trunk/reportlab/lib/styles.py
 from django.conf import settings
 import os
+import StringIO
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
@@ -420,25 +421,31 @@ class PageNumCanvas(canvas.Canvas):
         self.drawRightString(self._pagesize[0] / 2, 10*mm, page)
 
 
-
-def fill_page_with_image(path, canvas):
+def page_number_overlay(page_count, pagesize):
     """
-    Given the path to an image and a reportlab canvas, fill the current page
-    with the image.
+    Returns PDF with only page numbers drawn the same way as PageNumCanvas.
+    Used to number pages of PDF that is merged from separately built parts.
+    """
+    output = StringIO.StringIO()
+    numbers = canvas.Canvas(output, pagesize=pagesize)
+    for page_number in range(1, page_count + 1):
+        numbers.setFont(_baseFontName, 9)
+        numbers.drawRightString(pagesize[0] / 2, 10*mm, "%s / %s" % (page_number, page_count))
+        numbers.showPage()
+    numbers.save()
+    output.seek(0)
+    return output
 
-    This function takes into consideration EXIF orientation information (making
-    it compatible with photos taken from iOS devices).
 
-    This function makes use of ``canvas.setPageRotation()`` and
-    ``canvas.setPageSize()`` which will affect subsequent pages, so be sure to
-    reset them to appropriate values after calling this function.
 
-    :param   path: filesystem path to an image
-    :param canvas: ``reportlab.canvas.Canvas`` object
+def get_page_image_layout(path, pagesize):
+    """
+    Returns tuple (page rotation, page size, (x, y, width, height)) that fill_page_with_image uses to fill
+    page with the image. Path can be filesystem path or file object.
     """
     from PIL import Image
 
-    page_width, page_height = canvas._pagesize
+    page_width, page_height = pagesize
 
     image = Image.open(path)
     image_width, image_height = image.size
@@ -460,17 +467,17 @@ def fill_page_with_image(path, canvas):
     }
     draw_width, draw_height = page_width, page_height
     if orientation == 1:
-        canvas.setPageRotation(0)
+        rotation = 0
     elif orientation == 3:
-        canvas.setPageRotation(180)
+        rotation = 180
     elif orientation == 6:
         image_width, image_height = image_height, image_width
         draw_width, draw_height = page_height, page_width
-        canvas.setPageRotation(90)
+        rotation = 90
     elif orientation == 8:
         image_width, image_height = image_height, image_width
         draw_width, draw_height = page_height, page_width
-        canvas.setPageRotation(270)
+        rotation = 270
     else:
         raise ValueError("Unsupported image orientation '%s'."
                          % ORIENTATIONS[orientation])
@@ -478,7 +485,6 @@ def fill_page_with_image(path, canvas):
     if image_width > image_height:
         page_width, page_height = page_height, page_width  # flip width/height
         draw_width, draw_height = draw_height, draw_width
-        canvas.setPageSize((page_width, page_height))
 
     # Ameriks custom implementation to position in the middle image.
     # TODO: Testing with rotated image
@@ -497,5 +503,28 @@ def fill_page_with_image(path, canvas):
     if draw_height > page_height:
         y = (page_height - draw_height) / 2.0
 
+    return rotation, (page_width, page_height), (x, y, draw_width, draw_height)
+
+
+def fill_page_with_image(path, canvas):
+    """
+    Given the path to an image and a reportlab canvas, fill the current page
+    with the image.
+
+    This function takes into consideration EXIF orientation information (making
+    it compatible with photos taken from iOS devices).
+
+    This function makes use of ``canvas.setPageRotation()`` and
+    ``canvas.setPageSize()`` which will affect subsequent pages, so be sure to
+    reset them to appropriate values after calling this function.
+
+    :param   path: filesystem path to an image
+    :param canvas: ``reportlab.canvas.Canvas`` object
+    """
+    rotation, pagesize, (x, y, draw_width, draw_height) = get_page_image_layout(path, canvas._pagesize)
+    canvas.setPageRotation(rotation)
+    if pagesize != tuple(canvas._pagesize):
+        canvas.setPageSize(pagesize)
+
     canvas.drawImage(path, x, y, width=draw_width, height=draw_height,
                      preserveAspectRatio=True)
\ No newline at end of file
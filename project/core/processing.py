@@ -0,0 +1,45 @@
+"""
+Per process registry of competition processing class instances.
+Instances are resolved once per competition id and reused, so hot paths do not import and instantiate
+processing class on every call. Instances are keyed by competition hierarchy snapshot version, which is shared
+through cache, so all processes build them again after any Competition is saved or deleted.
+"""
+from core.hierarchy import get_hierarchy, get_hierarchy_version
+from velo.utils import load_class
+
+_registry = {}  # competition_id: (hierarchy version, instance)
+
+
+def get_processing_class(competition=None, competition_id=None):
+    """
+    Returns processing class instance for competition or None if competition does not have processing class.
+    """
+    if competition is not None:
+        competition_id = competition.id
+    version = get_hierarchy_version()
+    entry = _registry.get(competition_id)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    if competition is None:
+        hierarchy = get_hierarchy()
+        if competition_id in hierarchy:
+            competition = hierarchy.competitions[competition_id]
+        else:
+            from core.models import Competition
+            competition = Competition.objects.get(id=competition_id)
+
+    instance = None
+    if competition.processing_class:
+        class_ = load_class(competition.processing_class)
+        instance = class_(competition=competition)
+    _registry[competition_id] = (version, instance)
+    return instance
+
+
+def invalidate_processing_classes(sender=None, **kwargs):
+    """
+    All instances are dropped, because stage instances depend on parent and sibling competitions.
+    Other processes drop them when they see new hierarchy version.
+    """
+    _registry.clear()
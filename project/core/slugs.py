@@ -0,0 +1,45 @@
+"""
+Participant and team member slug calculation.
+CustomSlug overrides are kept in memory as {(first_name, last_name, birthday): slug} and dropped on CustomSlug change.
+"""
+from django.template.defaultfilters import slugify
+from core.snapshots import VersionedSnapshot
+
+
+def _build_custom_slugs():
+    from core.models import CustomSlug
+    return dict(((first_name, last_name, birthday), slug) for first_name, last_name, birthday, slug in CustomSlug.objects.values_list('first_name', 'last_name', 'birthday', 'slug'))
+
+_custom_slugs = VersionedSnapshot('custom_slugs', _build_custom_slugs)
+
+
+def invalidate_custom_slugs(sender=None, **kwargs):
+    _custom_slugs.invalidate()
+
+
+def get_custom_slug(first_name, last_name, birthday):
+    return _custom_slugs.get().get((first_name, last_name, birthday))
+
+
+def make_slug(first_name, last_name, birthday):
+    """
+    Returns CustomSlug override if there is one, otherwise slug is built from name and birth year.
+    If birthday is unknown, then slug is built from name only.
+    """
+    if not birthday:
+        return slugify('%s-%s' % (first_name, last_name))
+    return get_custom_slug(first_name, last_name, birthday) or slugify('%s-%s-%i' % (first_name, last_name, birthday.year))
+
+
+def make_slugs(people):
+    """
+    Batch version of make_slug. Accepts iterable of (first_name, last_name, birthday) and returns list of slugs.
+    """
+    custom_slugs = _custom_slugs.get()
+    slugs = []
+    for first_name, last_name, birthday in people:
+        if not birthday:
+            slugs.append(slugify('%s-%s' % (first_name, last_name)))
+        else:
+            slugs.append(custom_slugs.get((first_name, last_name, birthday)) or slugify('%s-%s-%i' % (first_name, last_name, birthday.year)))
+    return slugs
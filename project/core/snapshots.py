@@ -0,0 +1,40 @@
+"""
+Process memory copies of small, rarely changing tables.
+Built snapshot is stored in cache together with its version. Process copy is compared with cache version
+at most every check_interval seconds, so lookups are answered from memory without queries.
+"""
+import time
+from django.core.cache import cache
+
+
+class VersionedSnapshot(object):
+    def __init__(self, name, builder, check_interval=5):
+        self.cache_key = name
+        self.version_key = '%s_version' % name
+        self.builder = builder
+        self.check_interval = check_interval
+        self.snapshot = None
+        self.version = None
+        self.checked = 0
+
+    def get(self):
+        now = time.time()
+        if self.snapshot is not None and now - self.checked < self.check_interval:
+            return self.snapshot
+
+        version = cache.get(self.version_key)
+        if self.snapshot is None or self.version != version:
+            cached = cache.get(self.cache_key)
+            if cached is not None and version is not None and cached[0] == version:
+                self.version, self.snapshot = cached
+            else:
+                self.version, self.snapshot = int(time.time() * 1000), self.builder()
+                cache.set(self.cache_key, (self.version, self.snapshot), None)
+                cache.set(self.version_key, self.version, None)
+
+        self.checked = now
+        return self.snapshot
+
+    def invalidate(self, sender=None, **kwargs):
+        self.snapshot = None
+        cache.delete_many([self.cache_key, self.version_key])
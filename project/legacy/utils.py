@@ -19,6 +19,7 @@ from django.conf import settings
 from social.apps.django_app.default.models import UserSocialAuth
 
 from payment.models import Price, DiscountCode, Payment, DiscountCampaign
+from registration.bulk import bulk_save_participants
 from registration.models import Application, Participant
 from results.models import LegacySEBStandingsResult, LegacyResult
 from team.models import Team, Member, MemberApplication
@@ -438,6 +439,8 @@ def sync_payments():
 
 def sync_participants():
     participants = Ev68RVeloParticipations.objects.filter(competition_id__in=(37, 41, ), distance_id__gt=0)  # 40,  removed complex
+    existing = dict((participant.legacy_id, participant) for participant in Participant.objects.exclude(legacy_id=None))
+    batch = []
 
     for obj in participants:
         print obj.id
@@ -490,13 +493,17 @@ def sync_participants():
         if obj.participant_where:
             data.update({'where_heard': Choices.objects.get(title=obj.participant_where.strip(), kind=Choices.KIND_HEARD),})
         #
-        participant, created = Participant.objects.get_or_create(legacy_id=obj.id, defaults=data)
-        if not created:
-            if participant.distance != data.get('distance'):
+        participant = existing.get(obj.id)
+        if participant:
+            if participant.distance_id != data.get('distance').id:
                 print 'participant id %i changed distance to %s' % (participant.id, data.get('distance'))
-            for d in data:
-                setattr(participant, d, data.get(d))
-            participant.save()
+        else:
+            participant = Participant(legacy_id=obj.id)
+        for d in data:
+            setattr(participant, d, data.get(d))
+        batch.append(participant)
+
+    print bulk_save_participants(batch)
 
 
 def sync_users(update=False, start=0, end=1000000):
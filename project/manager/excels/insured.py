@@ -31,7 +31,7 @@ def create_insured_list(competition=None, competition_id=None):
         for index, item in enumerate(participants, start=1):
             insurance_price  = item.insurance.price
             if item.competition.tree_id == 2 and item.competition.level == 1: # SEB complex
-                insurance_price = (insurance_price * (100 - item.competition.complex_discount) / 100) * len(item.competition.get_children())
+                insurance_price = (insurance_price * (100 - item.competition.complex_discount) / 100) * len(item.competition.get_stages())
 
             row_values = (
                 index, unicode(item.competition), item.first_name, item.last_name, unicode(item.birthday), item.ssn, unicode(item.country), unicode(item.city) if item.city else '', item.phone_number, item.email, insurance_price, unicode(item.insurance),)
@@ -1,25 +1,66 @@
 # coding=utf-8
 from __future__ import unicode_literals
+import codecs
+import csv
+from decimal import Decimal
 from difflib import get_close_matches
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Min
 from django.template.defaultfilters import slugify
 import pytz
+import tempfile
+import xlsxwriter
 import xlwt
 import StringIO
 from core.models import Competition
 from payment.models import Payment
 from registration.models import Participant, Number, Application
-from results.models import Result, SebStandings
+from results.models import Result, SebStandings, LegacyResult
 
 riga_tz = pytz.timezone("Europe/Riga")
 
 
+class _Echo(object):
+    def write(self, value):
+        return value
+
+
+def _encode(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return unicode(value).encode('utf-8')
+
+
+class NumberIndex(object):
+    """
+    Numbers of distances loaded with one query and kept by (participant slug, distance), ordered by number descending.
+    Replaces Number query done for every exported row.
+    """
+    def __init__(self, distance_ids):
+        self.numbers = {}
+        for number in Number.objects.filter(distance_id__in=distance_ids).exclude(participant_slug='').order_by('-number'):
+            self.numbers.setdefault((number.participant_slug, number.distance_id), []).append(number)
+
+    def get(self, slug, distance_id, competition_ids, group=None):
+        """
+        The same filtering as Participant.numbers - B groups get only numbers of their group.
+        """
+        return [number for number in self.numbers.get((slug, distance_id), ())
+                if number.competition_id in competition_ids and (not group or group[0] != 'B' or number.group == group)]
+
+    def get_for_participant(self, participant):
+        participant.set_group()
+        return self.get(participant.slug, participant.distance_id, participant.competition.get_ids(), participant.group)
+
+
 def create_standing_list(competition=None, competition_id=None):
     if not competition and not competition_id:
         raise Exception('Expected at least one variable')
     if not competition:
         competition = Competition.objects.get(id=competition_id)
     output = StringIO.StringIO()
-    distances = competition.get_distances()
+    distances = list(competition.get_distances())
+    number_index = NumberIndex([distance.id for distance in distances])
 
     wbk = xlwt.Workbook()
 
@@ -43,7 +84,7 @@ def create_standing_list(competition=None, competition_id=None):
                 index, item.id, unicode(item.participant.primary_number), item.participant_slug, unicode(item.participant.competition), unicode(item.participant.distance), item.participant.last_name,
                 item.participant.first_name, item.participant.birthday.strftime("%Y-%m-%d"), item.participant.gender, item.participant.group,
                 item.participant.email, item.participant.phone_number, unicode(item.participant.country), item.participant.team_name, unicode(item.participant.bike_brand2) if item.participant.bike_brand2 else '',
-                item.distance_place, item.distance_total, ','.join([str(obj.number) for obj in item.participant.numbers()]))
+                item.distance_place, item.distance_total, ','.join([str(obj.number) for obj in number_index.get_for_participant(item.participant)]))
 
             for col, value in enumerate(row_values):
                 sheet.write(row, col, value)
@@ -53,6 +94,63 @@ def create_standing_list(competition=None, competition_id=None):
     return output
 
 
+PAYMENT_LIST_HEADER = (
+    'ID', 'Izveidots', 'Labots', 'Sacensības', 'Statuss', 'www.velo.lv ID', 'Uzņēmums', 'Rēķina numurs', 'Fināla cena',
+    'Ebill kods', 'Ebill Statuss', 'Ebill summa', 'Ebill Kanāls')
+
+PAYMENT_SUMMARY_HEADER = ('Kanāls', 'Maksājumu skaits', 'Summa', 'Ziedojumi')
+
+
+class PaymentReconciliation(object):
+    """
+    Paid applications with their successful payments.
+    Applications and payments are read with one query each and grouped in Python,
+    totals per payment channel are counted in the same pass while rows are generated.
+    """
+    def __init__(self, competition):
+        self.competition = competition
+        self.channel_totals = {}  # channel: [payment count, total, donation]
+
+    def rows(self):
+        applications = Application.objects.filter(competition_id__in=self.competition.get_ids(),
+                                                  payment_status=Application.PAY_STATUS_PAYED)
+
+        payments = {}  # application_id: [payments]
+        payment_queryset = Payment.objects.filter(content_type=ContentType.objects.get_for_model(Application),
+                                                  object_id__in=applications.values('id'),
+                                                  status=Payment.STATUS_OK).select_related('channel__payment_channel').order_by('id')
+        for payment in payment_queryset:
+            payments.setdefault(payment.object_id, []).append(payment)
+
+        for application in applications.select_related('competition').order_by('id').iterator():
+            row_values = (
+                application.id, application.created.date(), application.modified.date(), unicode(application.competition), application.get_payment_status_display(),
+                application.legacy_id, application.company_name, application.external_invoice_nr, application.final_price,
+            )
+            for payment in payments.get(application.id, ()):
+                channel = unicode(payment.channel)
+                row_values += (
+                    payment.erekins_code, payment.get_status_display(), payment.total, channel,
+                )
+                totals = self.channel_totals.setdefault(channel, [0, Decimal('0.00'), Decimal('0.00')])
+                totals[0] += 1
+                totals[1] += payment.total
+                totals[2] += payment.donation
+            yield row_values
+
+    def summary_rows(self):
+        """
+        Should be called after all rows are generated.
+        """
+        count, total, donation = 0, Decimal('0.00'), Decimal('0.00')
+        for channel, (channel_count, channel_total, channel_donation) in sorted(self.channel_totals.items()):
+            count += channel_count
+            total += channel_total
+            donation += channel_donation
+            yield channel, channel_count, channel_total, channel_donation
+        yield 'Kopā', count, total, donation
+
+
 def payment_list(competition=None, competition_id=None):
     if not competition and not competition_id:
         raise Exception('Expected at least one variable')
@@ -62,35 +160,120 @@ def payment_list(competition=None, competition_id=None):
 
     wbk = xlwt.Workbook()
 
-    applications = Application.objects.filter(competition_id__in=competition.get_ids(),
-                                              payment_status=Application.PAY_STATUS_PAYED)
+    reconciliation = PaymentReconciliation(competition)
 
     sheet = wbk.add_sheet('Applications')
     row = 4
-    header_row = (
-        'ID', 'Izveidots', 'Labots', 'Sacensības', 'Statuss', 'www.velo.lv ID', 'Uzņēmums', 'Rēķina numurs', 'Fināla cena',
-        'Ebill kods', 'Ebill Statuss', 'Ebill summa', 'Ebill Kanāls')
-    for col, value in enumerate(header_row):
+    for col, value in enumerate(PAYMENT_LIST_HEADER):
         sheet.write(row, col, value)
     row += 1
-    for application in applications:
-        payments = application.payment_set.filter(status=Payment.STATUS_OK)
-        row_values = (
-            application.id, application.created.date(), application.modified.date(), unicode(application.competition), application.get_payment_status_display(),
-            application.legacy_id, application.company_name, application.external_invoice_nr, application.final_price,
-        )
-        for payment in payments:
-            row_values += (
-                payment.erekins_code, payment.get_status_display(), payment.total, unicode(payment.channel),
-            )
+    for row_values in reconciliation.rows():
         for col, value in enumerate(row_values):
             sheet.write(row, col, value)
         row += 1
 
+    sheet = wbk.add_sheet('Summary')
+    for row, row_values in enumerate((PAYMENT_SUMMARY_HEADER, ) + tuple(reconciliation.summary_rows())):
+        for col, value in enumerate(row_values):
+            sheet.write(row, col, value)
+
     wbk.save(output)
     return output
 
 
+def stream_payment_list_csv(competition):
+    """
+    Generator of encoded CSV lines. Channel summary is written after application rows.
+    """
+    reconciliation = PaymentReconciliation(competition)
+    writer = csv.writer(_Echo(), delimiter=str(';'))
+    yield codecs.BOM_UTF8
+    yield writer.writerow([_encode(value) for value in PAYMENT_LIST_HEADER])
+    for row_values in reconciliation.rows():
+        yield writer.writerow([_encode(value) for value in row_values])
+    yield writer.writerow([])
+    yield writer.writerow([_encode(value) for value in PAYMENT_SUMMARY_HEADER])
+    for row_values in reconciliation.summary_rows():
+        yield writer.writerow([_encode(value) for value in row_values])
+
+
+
+START_LIST_HEADER = (
+    '#', 'UID', 'Numurs', 'Alias', 'Sacensības', 'Distance', 'Uzvārds', 'Vārds', 'Dzimšanas diena', 'Dzimums',
+    'Grupa', 'Dalības maksa', 'Apdrošināšanas maksa', 'Kopā samaksāts', 'Atlaižu kods', 'E-pasts', 'Telefons', 'Valsts', 'Komanda', 'Velo', 'Izveidots', 'Rezultāts', 'Pieteicies citām sacensibas')
+
+
+class StartListSeeding(object):
+    """
+    Seeding columns of start list loaded with one aggregated query each instead of per participant subselects.
+    SEB stages get result of previous standings and count of other stages applied, competition 35 gets best legacy result.
+    """
+    def __init__(self, competition):
+        self.last_results = None  # (slug or participant id, distance_id): result
+        self.comp_counts = None  # slug: count of other stages participant has applied to
+        self.by_participant_id = False
+
+        if competition.tree_id in (1, 2):
+            if competition.parent_id and competition.get_previous_sibling():
+                standings = SebStandings.objects.filter(competition_id=competition.parent_id)
+                self.last_results = {}
+                for slug, distance_id, group_place, distance_place in standings.values_list('participant_slug', 'distance_id', 'group_place', 'distance_place'):
+                    self.last_results[(slug, distance_id)] = group_place if distance_id == 27 else distance_place
+
+                competition_ids = [competition.parent_id] + [obj.id for obj in competition.parent.get_stages()]
+                counts = Participant.objects.filter(competition_id__in=competition_ids, is_participating=True).exclude(competition_id=competition.id).values('slug').annotate(Count('id'))
+                self.comp_counts = dict((obj.get('slug'), obj.get('id__count')) for obj in counts)
+        elif competition.id == 35:
+            results = LegacyResult.objects.filter(participant_2014__competition_id__in=competition.get_ids())
+            self.last_results = dict(((obj.get('participant_2014_id'), obj.get('distance_id')), obj.get('result_distance__min')) for obj in results.values('participant_2014_id', 'distance_id').annotate(Min('result_distance')))
+            self.by_participant_id = True
+
+    def columns(self, item):
+        if self.last_results is None:
+            return ()
+        key = (item.id if self.by_participant_id else item.slug, item.distance_id)
+        row_values = (self.last_results.get(key) or '', )
+        if self.comp_counts is not None:
+            row_values += (self.comp_counts.get(item.slug, 0), )
+        return row_values
+
+
+def start_list_rows(competition):
+    """
+    Generator of (distance, row values) for all participating participants ordered by distance.
+    All distances are read with one joined query that is iterated without caching, so memory does not grow with participant count.
+    """
+    seeding = StartListSeeding(competition)
+    items = Participant.objects.filter(competition_id__in=competition.get_ids(), is_participating=True)\
+        .select_related('competition', 'distance', 'price', 'primary_number', 'application', 'application__discount_code')\
+        .order_by('distance___order', 'distance_id', 'primary_number__group', 'primary_number__number', 'registration_dt')
+
+    distance_id = None
+    index = 0
+    for item in items.iterator():
+        if item.distance_id != distance_id:
+            distance_id = item.distance_id
+            index = 0
+        index += 1
+
+        total_entry_fee = item.total_entry_fee
+        total_insurance_fee = item.total_insurance_fee
+        final_price = item.final_price
+
+        if item.competition.tree_id in (1, 2) and item.competition.level == 1:
+            child_count = len(item.competition.get_stages())
+            total_entry_fee = total_entry_fee / child_count
+            total_insurance_fee = total_insurance_fee / child_count
+            final_price = final_price / child_count
+
+        row_values = (
+            index, item.id, unicode(item.primary_number), item.slug, unicode(item.competition), unicode(item.distance), item.last_name,
+            item.first_name, item.birthday.strftime("%Y-%m-%d"), item.gender, item.group, total_entry_fee, total_insurance_fee, final_price,
+            unicode(item.application.discount_code or '') if item.application else '', item.email, item.phone_number, unicode(item.country), item.team_name, unicode(item.bike_brand2) if item.bike_brand2 else '',
+            item.registration_dt.astimezone(riga_tz).strftime("%Y-%m-%d %H:%M"))
+
+        yield item.distance, row_values + seeding.columns(item)
+
 
 def create_start_list(competition=None, competition_id=None):
     if not competition and not competition_id:
@@ -98,91 +281,60 @@ def create_start_list(competition=None, competition_id=None):
     if not competition:
         competition = Competition.objects.get(id=competition_id)
     output = StringIO.StringIO()
-    distances = competition.get_distances()
 
     wbk = xlwt.Workbook()
 
-    for distance in distances:
-        sheet = wbk.add_sheet(slugify(distance.__unicode__())[:30])
-        slugs = []
-        items = distance.participant_set.filter(competition_id__in=competition.get_ids(),
-                                                is_participating=True).select_related('competition', 'distance',
-                                                                                      'price', 'primary_number').order_by('distance', 'primary_number__group', 'primary_number__number', 'registration_dt')
-        if competition.tree_id == 1 or competition.tree_id == 2: # SEB
-            prev = competition.get_previous_sibling()
-            if prev:
-                slugs = [obj.participant_slug for obj in SebStandings.objects.filter(competition=competition.parent.id, distance=distance)]
-
-                if distance.id == 27:
-                    select = 'group_place'
-                else:
-                    select = 'distance_place'
-
-                items = items.extra(
-                    select={
-                        'last_result_distance': "SELECT r."+select+" FROM results_sebstandings r WHERE r.competition_id=%s and r.participant_slug=registration_participant.slug and r.distance_id=registration_participant.distance_id",
-                    },
-                    select_params=(competition.parent.id, ),
-                )
-
-                items = items.extra(
-                    select={
-                        'comp_count': "Select count(*) from registration_participant p_count left outer join core_competition cc_count on p_count.competition_id = cc_count.id WHERE p_count.slug = registration_participant.slug and p_count.is_participating is True and (cc_count.id = %s or cc_count.parent_id = %s) AND cc_count.id <> %s"
-                    },
-                    select_params=(competition.parent.id, competition.parent.id, competition.id),
-                )
-        elif competition.id == 35:
-            items = items.extra(
-                select={
-                    'last_result_distance': "SELECT min(r.result_distance) FROM results_legacyresult r WHERE r.participant_2014_id=registration_participant.id and r.distance_id = registration_participant.distance_id order by r.result_distance LIMIT 1",
-                },
-            )
+    sheet = distance = None
+    row = 5
+    for item_distance, row_values in start_list_rows(competition):
+        if item_distance != distance:
+            distance = item_distance
+            sheet = wbk.add_sheet(slugify(distance.__unicode__())[:30])
+            for col, value in enumerate(START_LIST_HEADER):
+                sheet.write(4, col, value)
+            row = 5
 
-        row = 4
-        header_row = (
-            '#', 'UID', 'Numurs', 'Alias', 'Sacensības', 'Distance', 'Uzvārds', 'Vārds', 'Dzimšanas diena', 'Dzimums',
-            'Grupa', 'Dalības maksa', 'Apdrošināšanas maksa', 'Kopā samaksāts', 'Atlaižu kods', 'E-pasts', 'Telefons', 'Valsts', 'Komanda', 'Velo', 'Izveidots', 'Rezultāts', 'Pieteicies citām sacensibas')
-        for col, value in enumerate(header_row):
+        for col, value in enumerate(row_values):
             sheet.write(row, col, value)
+        row += 1
 
-        row = 5
-        for index, item in enumerate(items, start=1):
-            total_entry_fee = item.total_entry_fee
-            total_insurance_fee = item.total_insurance_fee
-            final_price = item.final_price
-
-            if item.competition.tree_id in (1, 2) and item.competition.level == 1:
-                child_count = item.competition.get_children().count()
-                total_entry_fee = total_entry_fee / child_count
-                total_insurance_fee = total_insurance_fee / child_count
-                final_price = final_price / child_count
-
+    wbk.save(output)
+    return output
 
-            row_values = (
-                index, item.id, unicode(item.primary_number), item.slug, unicode(item.competition), unicode(item.distance), item.last_name,
-                item.first_name, item.birthday.strftime("%Y-%m-%d"), item.gender, item.group, total_entry_fee, total_insurance_fee, final_price,
-                unicode(item.application.discount_code or '') if item.application else '', item.email, item.phone_number, unicode(item.country), item.team_name, unicode(item.bike_brand2) if item.bike_brand2 else '',
-                item.registration_dt.astimezone(riga_tz).strftime("%Y-%m-%d %H:%M"))
-
-            if competition.tree_id == 1 or competition.tree_id == 2:
-                if hasattr(item, 'last_result_distance') and getattr(item, 'last_result_distance', None):
-                    row_values += (item.last_result_distance, )
-                else:
-                    row_values += ('', )
-
-                if hasattr(item, 'comp_count'):
-                    row_values += (item.comp_count, )
-            elif competition.id == 35:
-                if hasattr(item, 'last_result_distance') and getattr(item, 'last_result_distance', None):
-                    row_values += (item.last_result_distance, )
-                else:
-                    row_values += ('', )
 
-            for col, value in enumerate(row_values):
-                sheet.write(row, col, value)
-            row += 1
+def stream_start_list_csv(competition):
+    """
+    Generator of encoded CSV lines, used with StreamingHttpResponse. Distance is included in every row.
+    """
+    writer = csv.writer(_Echo(), delimiter=str(';'))
+    yield codecs.BOM_UTF8  # Excel opens UTF-8 CSV correctly only with BOM
+    yield writer.writerow([_encode(value) for value in START_LIST_HEADER])
+    for distance, row_values in start_list_rows(competition):
+        yield writer.writerow([_encode(value) for value in row_values])
+
+
+def create_start_list_xlsx(competition):
+    """
+    XLSX start list with sheet per distance. Workbook is written in constant memory mode - every row is flushed to
+    temporary file as soon as it is written, so there is no row limit and memory does not grow with participant count.
+    Returns temporary file positioned at the beginning.
+    """
+    output = tempfile.TemporaryFile()
+    wbk = xlsxwriter.Workbook(output, {'constant_memory': True, 'in_memory': False})
+
+    sheet = distance = None
+    row = 5
+    for item_distance, row_values in start_list_rows(competition):
+        if item_distance != distance:
+            distance = item_distance
+            sheet = wbk.add_worksheet(slugify(distance.__unicode__())[:30])
+            sheet.write_row(4, 0, START_LIST_HEADER)
+            row = 5
+        sheet.write_row(row, 0, [float(value) if isinstance(value, Decimal) else value for value in row_values])
+        row += 1
 
-    wbk.save(output)
+    wbk.close()
+    output.seek(0)
     return output
 
 
@@ -193,7 +345,8 @@ def team_member_list(competition=None, competition_id=None):
     if not competition:
         competition = Competition.objects.get(id=competition_id)
     output = StringIO.StringIO()
-    distances = competition.get_distances().filter(can_have_teams=True)
+    distances = list(competition.get_distances().filter(can_have_teams=True))
+    number_index = NumberIndex([distance.id for distance in distances])
 
     notpayed_pattern = xlwt.Pattern()
     notpayed_pattern.pattern = xlwt.Pattern.SOLID_PATTERN
@@ -224,25 +377,28 @@ def team_member_list(competition=None, competition_id=None):
         sheet.write(row, 11, "Papildus numuri")
 
         row += 1
-        for team in distance.team_set.all():
-            for member in competition.memberapplication_set.filter(member__team=team).order_by('kind').select_related('member', 'participant', 'participant_unpaid', 'participant_potential', 'participant__primary_number',):
-                is_payed = True if member.participant_id else False
-                sheet.write(row, 0, unicode(team.id), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 1, unicode(team), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 2, unicode(member.member.first_name), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 3, unicode(member.member.last_name), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 4, unicode(member.member.birthday.year), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 5, unicode(member.get_kind_display()), payed_style if is_payed else not_payed_style)
-                sheet.write(row, 6, unicode(member.participant.slug) if member.participant else '', payed_style if is_payed else not_payed_style)
-                sheet.write(row, 7, unicode(member.participant.bike_brand2) if member.participant and member.participant.bike_brand2 else '', payed_style if is_payed else not_payed_style)
-                sheet.write(row, 8, unicode(member.participant_unpaid.slug) if member.participant_unpaid else '', payed_style if is_payed else not_payed_style)
-                sheet.write(row, 9, unicode(member.participant_potential.slug) if member.participant_potential else '', payed_style if is_payed else not_payed_style)
-                number = Number.objects.filter(participant_slug=member.member.slug, competition_id__in=competition.get_ids(), distance=team.distance).order_by('-number')
-                if number:
-                    sheet.write(row, 10, unicode(number[0]), payed_style if is_payed else not_payed_style)
-                    if number.count()>1:
-                        sheet.write(row, 11, unicode(','.join([str(obj.number) for obj in number[1:]])), payed_style if is_payed else not_payed_style)
-                row += 1
+        members = competition.memberapplication_set.filter(member__team__distance=distance)\
+            .order_by('-member__team__is_featured', 'member__team__title', 'member__team', 'kind')\
+            .select_related('member', 'member__team', 'participant', 'participant_unpaid', 'participant_potential', 'participant__primary_number',)
+        for member in members:
+            team = member.member.team
+            is_payed = True if member.participant_id else False
+            sheet.write(row, 0, unicode(team.id), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 1, unicode(team), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 2, unicode(member.member.first_name), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 3, unicode(member.member.last_name), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 4, unicode(member.member.birthday.year), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 5, unicode(member.get_kind_display()), payed_style if is_payed else not_payed_style)
+            sheet.write(row, 6, unicode(member.participant.slug) if member.participant else '', payed_style if is_payed else not_payed_style)
+            sheet.write(row, 7, unicode(member.participant.bike_brand2) if member.participant and member.participant.bike_brand2 else '', payed_style if is_payed else not_payed_style)
+            sheet.write(row, 8, unicode(member.participant_unpaid.slug) if member.participant_unpaid else '', payed_style if is_payed else not_payed_style)
+            sheet.write(row, 9, unicode(member.participant_potential.slug) if member.participant_potential else '', payed_style if is_payed else not_payed_style)
+            number = number_index.get(member.member.slug, team.distance_id, competition.get_ids())
+            if number:
+                sheet.write(row, 10, unicode(number[0]), payed_style if is_payed else not_payed_style)
+                if len(number)>1:
+                    sheet.write(row, 11, unicode(','.join([str(obj.number) for obj in number[1:]])), payed_style if is_payed else not_payed_style)
+            row += 1
 
     wbk.save(output)
     return output
@@ -290,6 +446,10 @@ def create_team_list(competition=None, competition_id=None):
         sheet.col(10).width = 256 * 5
 
 
+        members = {}  # team_id: [member applications ordered by kind]
+        for member in competition.memberapplication_set.filter(member__team__distance=distance).order_by('kind').select_related('member', 'participant', 'participant__primary_number'):
+            members.setdefault(member.member.team_id, []).append(member)
+
         row = 5
         for index, team in enumerate(distance.team_set.filter(member__memberapplication__competition=competition).distinct(), start=1):
             col_add = 0 if index % 2 == 1 else 6
@@ -297,7 +457,7 @@ def create_team_list(competition=None, competition_id=None):
             sheet.write(row, 1 + col_add, unicode(team))
             row += 1
             next_line = row
-            for member in competition.memberapplication_set.filter(member__team=team).order_by('kind'):
+            for member in members.get(team.id, ()):
                 is_payed = True if member.participant_id else False
 
 
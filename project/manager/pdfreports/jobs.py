@@ -0,0 +1,204 @@
+"""
+Result reports built in background by celery.
+Every distance section is rendered by separate task, so sections are built in parallel by worker processes.
+Task that finishes the last section merges all sections into one PDF and numbers its pages.
+Finished report is stored keyed by competition, report type and results version, so it is built again only
+after results change.
+"""
+import re
+import StringIO
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from reportlab.lib.pagesizes import A4
+from core.pdf import page_number_overlay
+from manager.pdfreports.result_reports import PDFReports
+from results.helper import get_results_version
+
+REPORT_JOB_TIMEOUT = 60 * 30
+
+# action: (PDFReports method, method kwargs, is team report)
+REPORTS = {
+    'results_groups': ('results_groups', {}, False),
+    'results_groups_top20': ('results_groups', {'top': 20}, False),
+    'results_gender': ('results_gender', {}, False),
+    'results_distance': ('results_distance', {}, False),
+    'results_distance_top20': ('results_distance', {'top': 20}, False),
+    'results_standings': ('results_standings', {}, False),
+    'results_standings_top20': ('results_standings', {'top': 20}, False),
+    'results_standings_groups': ('results_standings_groups', {}, False),
+    'results_standings_groups_top20': ('results_standings_groups', {'top': 20}, False),
+    'results_team': ('results_team', {}, True),
+    'results_team_standings': ('results_team_standings', {}, True),
+}
+
+
+def _report_dir(competition_id):
+    return 'reports/%i' % competition_id
+
+
+def get_report_path(competition_id, action, version):
+    return '%s/%s_%i.pdf' % (_report_dir(competition_id), action, version)
+
+
+def _section_path(competition_id, action, version, distance_id):
+    return '%s/sections/%s_%i_%i.pdf' % (_report_dir(competition_id), action, version, distance_id)
+
+
+def _job_key(competition_id, action, version):
+    return 'result_report_job_%i_%s_%i' % (competition_id, action, version)
+
+
+def _remaining_key(competition_id, action, version):
+    return 'result_report_remaining_%i_%s_%i' % (competition_id, action, version)
+
+
+def _failed_key(competition_id, action, version):
+    return 'result_report_failed_%i_%s_%i' % (competition_id, action, version)
+
+
+def _save(path, content):
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(content))
+
+
+def get_report(competition, action, version=None):
+    """
+    Returns storage path of report built for provided results version or None if it is not built yet.
+    If version is not provided, current results version is used.
+    """
+    if version is None:
+        version = get_results_version(competition.id)
+    path = get_report_path(competition.id, action, version)
+    return path if default_storage.exists(path) else None
+
+
+def is_report_failed(competition, action, version):
+    """
+    Returns True if build of report for provided results version failed or is not running any more.
+    Should be called only for report that is not built.
+    """
+    if cache.get(_failed_key(competition.id, action, version)):
+        return True
+    return cache.get(_job_key(competition.id, action, version)) is None
+
+
+def request_report(competition, action):
+    """
+    Starts report build if report for current results is not built and is not being built already.
+    Returns tuple (results version of report, storage path of finished report or None).
+    Results can change while report is being built, so status and download should use returned version.
+    """
+    from manager.tasks import build_result_report_section
+
+    version = get_results_version(competition.id)
+    path = get_report_path(competition.id, action, version)
+    if default_storage.exists(path):
+        return version, path
+    if not cache.add(_job_key(competition.id, action, version), True, REPORT_JOB_TIMEOUT):
+        return version, None  # Report is already being built
+    cache.delete(_failed_key(competition.id, action, version))
+
+    method, kwargs, is_team = REPORTS[action]
+    report = PDFReports(competition=competition)
+    distances = report.get_team_distances() if is_team else report.get_result_distances()
+    distance_ids = list(distances.values_list('id', flat=True))
+
+    if not distance_ids:
+        try:
+            getattr(report, method)(**kwargs)
+            _save(path, report.build().getvalue())
+        finally:
+            cache.delete(_job_key(competition.id, action, version))
+        return version, path
+
+    cache.set(_remaining_key(competition.id, action, version), len(distance_ids), REPORT_JOB_TIMEOUT)
+    for distance_id in distance_ids:
+        build_result_report_section.delay(competition.id, action, version, distance_id, distance_ids)
+    return version, None
+
+
+def build_section(competition_id, action, version, distance_id, distance_ids):
+    """
+    Renders report part of one distance. If it is the last part, then report is merged.
+    """
+    method, kwargs, is_team = REPORTS[action]
+    try:
+        report = PDFReports(competition_id=competition_id, distance_ids=[distance_id])
+        getattr(report, method)(**kwargs)
+        output = report.build(page_numbers=False)
+        _save(_section_path(competition_id, action, version, distance_id), output.getvalue())
+        output.close()
+    except Exception:
+        fail_report(competition_id, action, version, distance_ids)
+        raise
+
+    try:
+        remaining = cache.decr(_remaining_key(competition_id, action, version))
+    except ValueError:
+        # Job has failed or expired, report will be requested again.
+        _delete_sections(competition_id, action, version, [distance_id])
+        return
+    if remaining == 0:
+        try:
+            merge_sections(competition_id, action, version, distance_ids)
+        except Exception:
+            fail_report(competition_id, action, version, distance_ids)
+            raise
+
+
+def _delete_sections(competition_id, action, version, distance_ids):
+    for distance_id in distance_ids:
+        path = _section_path(competition_id, action, version, distance_id)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+
+
+def fail_report(competition_id, action, version, distance_ids):
+    """
+    Stops report job, so sections still being built are discarded, and marks report as failed for status polling.
+    """
+    cache.delete_many([_job_key(competition_id, action, version), _remaining_key(competition_id, action, version)])
+    cache.set(_failed_key(competition_id, action, version), True, REPORT_JOB_TIMEOUT)
+    _delete_sections(competition_id, action, version, distance_ids)
+
+
+def merge_sections(competition_id, action, version, distance_ids):
+    writer = PdfFileWriter()
+    sections = []
+    for distance_id in distance_ids:
+        section = default_storage.open(_section_path(competition_id, action, version, distance_id), 'rb')
+        sections.append(section)
+        reader = PdfFileReader(section)
+        for page_index in range(reader.getNumPages()):
+            writer.addPage(reader.getPage(page_index))
+
+    page_count = writer.getNumPages()
+    numbers = PdfFileReader(page_number_overlay(page_count, A4))
+    for page_index in range(page_count):
+        writer.getPage(page_index).mergePage(numbers.getPage(page_index))
+
+    output = StringIO.StringIO()
+    writer.write(output)
+    _save(get_report_path(competition_id, action, version), output.getvalue())
+    output.close()
+
+    for section in sections:
+        section.close()
+    _delete_sections(competition_id, action, version, distance_ids)
+    delete_old_reports(competition_id, action, version)
+    cache.delete_many([_job_key(competition_id, action, version), _remaining_key(competition_id, action, version)])
+
+
+def delete_old_reports(competition_id, action, version):
+    """
+    Deletes reports of the same type built for previous results versions.
+    """
+    pattern = re.compile(r'^%s_(\d+)\.pdf$' % re.escape(action))
+    directories, files = default_storage.listdir(_report_dir(competition_id))
+    for filename in files:
+        match = pattern.match(filename)
+        if match and int(match.group(1)) < version:  # Newer report can be built by other job and still be downloaded
+            default_storage.delete('%s/%s' % (_report_dir(competition_id), filename))
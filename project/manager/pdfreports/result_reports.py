@@ -5,6 +5,7 @@ import pytz
 import xlwt
 import StringIO
 from reportlab.lib import colors
+from django.db import connection
 from core.models import Competition
 from core.pdf import getSampleStyleSheet, ParagraphStyle, PageNumCanvas, base_table_style
 from registration.models import Participant
@@ -12,8 +13,9 @@ from results.models import Result, SebStandings, TeamResultStandings
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer, PageBreak, Image as pdfImage
 from reportlab.lib.units import inch, cm
+from reportlab.pdfgen import canvas
 from team.models import MemberApplication
-from velo.utils import load_class
+from core.processing import get_processing_class
 from PIL import Image
 
 riga_tz = pytz.timezone("Europe/Riga")
@@ -32,6 +34,53 @@ group_table_style = base_table_style[:] + [
 ]
 
 
+def _column(model, lookup):
+    qn = connection.ops.quote_name
+    names = lookup.split('__')
+    for name in names[:-1]:
+        model = model._meta.get_field(name).rel.to
+    return '%s.%s' % (qn(model._meta.db_table), qn(model._meta.get_field(names[-1]).column))
+
+
+def top_per_group(queryset, group_lookup, order_by, top):
+    """
+    Limits queryset to first top rows of every group_lookup value, so only rows printed in report are loaded.
+    On PostgreSQL rows are numbered with window function and only ids within top are read,
+    on other databases ids and group values of all rows are read and limited in python.
+    """
+    model = queryset.model
+    if connection.vendor == 'postgresql':
+        order = ', '.join('%s DESC' % _column(model, field[1:]) if field[0] == '-' else _column(model, field) for field in order_by)
+        ranked = queryset.order_by().extra(select={
+            'group_rank': 'row_number() OVER (PARTITION BY %s ORDER BY %s)' % (_column(model, group_lookup), order),
+        }).values_list('id', 'group_rank')
+        sql, params = ranked.query.sql_with_params()
+        cursor = connection.cursor()
+        cursor.execute('SELECT ranked.id FROM (%s) ranked WHERE ranked.group_rank <= %%s' % sql, tuple(params) + (top, ))
+        ids = [row[0] for row in cursor.fetchall()]
+    else:
+        counts = {}
+        ids = []
+        for obj_id, group in queryset.order_by(*order_by).values_list('id', group_lookup):
+            if counts.get(group, 0) < top:
+                counts[group] = counts.get(group, 0) + 1
+                ids.append(obj_id)
+    return queryset.filter(id__in=ids).order_by(*order_by)
+
+
+def group_items(items, key, top):
+    """
+    Splits ordered items by key keeping order and not more than top items in every part.
+    Used to render all groups of distance from one query.
+    """
+    grouped = {}
+    for obj in items:
+        part = grouped.setdefault(key(obj), [])
+        if len(part) < top:
+            part.append(obj)
+    return grouped
+
+
 class PDFReports(object):
     competition = None
     primary_competition = None
@@ -40,7 +89,7 @@ class PDFReports(object):
     elements = None
     processing_class = None
 
-    def __init__(self, competition=None, competition_id=None):
+    def __init__(self, competition=None, competition_id=None, distance_ids=None):
         if not competition and not competition_id:
             raise Exception('Expected at least one variable')
         if not competition:
@@ -56,11 +105,24 @@ class PDFReports(object):
         self.doc = SimpleDocTemplate(self.output, pagesize=A4, topMargin=0.2 * inch, bottomMargin=0.8 * inch,
                                      leftMargin=0.2 * inch, rightMargin=0.2 * inch, showBoundary=0)
 
-        class_ = load_class(self.competition.processing_class)
-        self.processing_class = class_(self.competition.id)
+        self.processing_class = get_processing_class(self.competition)
+        self.distance_ids = distance_ids  # Used to render only part of report
 
         self.elements = []
 
+    def get_result_distances(self):
+        distances = self.competition.get_distances().filter(have_results=True).exclude(
+            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        if self.distance_ids is not None:
+            distances = distances.filter(id__in=self.distance_ids)
+        return distances
+
+    def get_team_distances(self):
+        distances = self.competition.get_distances().filter(can_have_teams=True)
+        if self.distance_ids is not None:
+            distances = distances.filter(id__in=self.distance_ids)
+        return distances
+
     def header(self, title):
         image = Image.open(self.primary_competition.logo.path)
         image_width, image_height = image.size
@@ -122,8 +184,7 @@ class PDFReports(object):
     def results_standings(self, top=1000):
         col_width = (
             1 * cm, 1 * cm, 2.5 * cm, 2.5 * cm, 2 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm)
-        distances = self.competition.get_distances().filter(have_results=True).exclude(
-            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        distances = self.get_result_distances()
         for distance in distances:
             self.elements.append(self.header(unicode("Kopvērtējums pa distancēm")))
 
@@ -133,7 +194,7 @@ class PDFReports(object):
                                                  'participant__primary_number')[:top]
             data = [[Paragraph(unicode(distance), styles["Heading2"]), '', '', '', '', ''], ]
             if items:
-                children_count = self.primary_competition.children.count()
+                children_count = len(self.primary_competition.get_stages())
                 data_line = ['', '#', 'Vārds', 'Uzvārds', 'Gads']
                 for index in range(1, children_count + 1):
                     data_line.append('%i.' % index)
@@ -159,19 +220,23 @@ class PDFReports(object):
     def results_standings_groups(self, top=1000):
         col_width = (
             1 * cm, 1 * cm, 2.5 * cm, 2.5 * cm, 2 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm, 1 * cm)
-        distances = self.competition.get_distances().filter(have_results=True).exclude(
-            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        distances = self.get_result_distances()
 
-        children_count = self.primary_competition.children.count()
+        children_count = len(self.primary_competition.get_stages())
 
         for distance in distances:
             self.elements.append(self.header(unicode("Kopvērtējums pa grupām")))
 
-            for group in self.processing_class.groups.get(distance.id):
+            groups = self.processing_class.groups.get(distance.id)
+            standings = SebStandings.objects.filter(distance=distance, competition=self.primary_competition,
+                                                    participant__group__in=groups)
+            standings = top_per_group(standings, 'participant__group', ('-group_total', ), top).select_related(
+                'participant', 'competition', 'distance', 'participant__primary_number')
+            by_group = group_items(standings, lambda obj: obj.participant.group, top)
+
+            for group in groups:
                 self.elements.append(Spacer(10, 10))
-                items = SebStandings.objects.filter(distance=distance, competition=self.primary_competition,
-                                                    participant__group=group).order_by('-group_total').select_related(
-                    'participant', 'competition', 'distance', 'participant__primary_number')[:top]
+                items = by_group.get(group)
                 data = [[Paragraph(unicode(group), styles["Heading2"]), '', '', unicode(distance), '', ''], ]
                 if items:
                     data_line = ['', '#', 'Vārds', 'Uzvārds', 'Gads']
@@ -198,8 +263,7 @@ class PDFReports(object):
 
     def results_distance(self, top=10000):
         col_width = (1 * cm, 1 * cm, 2.5 * cm, 2.5 * cm, 2 * cm, 4 * cm, 2 * cm, 1.2 * cm, 1.2 * cm, 1.4 * cm, 1.2 * cm)
-        distances = self.competition.get_distances().filter(have_results=True).exclude(
-            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        distances = self.get_result_distances()
         for distance in distances:
             self.elements.append(self.header(unicode("Rezultāti pa distancēm")))
 
@@ -221,16 +285,20 @@ class PDFReports(object):
 
     def results_groups(self, top=10000):
         col_width = (1 * cm, 1 * cm, 3 * cm, 3 * cm, 2 * cm, 4 * cm, 2 * cm, 1.2 * cm, 1.2 * cm)
-        distances = self.competition.get_distances().filter(have_results=True).exclude(
-            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        distances = self.get_result_distances()
         for distance in distances:
             self.elements.append(self.header(unicode("Rezultāti pa grupām")))
 
-            for group in self.processing_class.groups.get(distance.id):
+            groups = self.processing_class.groups.get(distance.id)
+            results = Result.objects.filter(participant__distance=distance, participant__group__in=groups,
+                                            competition=self.competition, status='')
+            results = top_per_group(results, 'participant__group', ('time', ), top).select_related(
+                'participant', 'number', 'participant__distance', 'competition', 'participant__competition')
+            by_group = group_items(results, lambda obj: obj.participant.group, top)
+
+            for group in groups:
                 self.elements.append(Spacer(10, 10))
-                items = Result.objects.filter(participant__distance=distance, participant__group=group,
-                                              competition=self.competition, status='').order_by('time').select_related(
-                    'participant', 'number', 'participant__distance', 'competition', 'participant__competition')[:top]
+                items = by_group.get(group)
                 header = [[Paragraph(unicode(group), styles["Heading2"]), '', '', unicode(distance), '', ''], ]
                 if items:
                     self.elements.append(
@@ -242,15 +310,17 @@ class PDFReports(object):
 
     def results_gender(self, top=10):
         col_width = (1 * cm, 1 * cm, 2.5 * cm, 2.5 * cm, 2 * cm, 4 * cm, 2 * cm, 1.2 * cm, 1.2 * cm, 1.4 * cm, 1.2 * cm)
-        distances = self.competition.get_distances().filter(have_results=True).exclude(
-            id=getattr(self.processing_class, 'BERNU_DISTANCE_ID', -1))
+        distances = self.get_result_distances()
         for distance in distances:
             self.elements.append(self.header(unicode("Rezultāti pa dzimumiem")))
+            results = Result.objects.filter(participant__distance=distance, participant__gender__in=('M', 'F'),
+                                            competition=self.competition, status='')
+            results = top_per_group(results, 'participant__gender', ('time', ), top).select_related(
+                'participant', 'number', 'participant__distance', 'competition', 'participant__competition')
+            by_gender = group_items(results, lambda obj: obj.participant.gender, top)
             for gender, gender_name in [('M', 'Vīrieši'), ('F', 'Sievietes')]:
                 self.elements.append(Spacer(10, 10))
-                items = Result.objects.filter(participant__distance=distance, participant__gender=gender,
-                                              competition=self.competition, status='').order_by('time').select_related(
-                    'participant', 'number', 'participant__distance', 'competition', 'participant__competition')[:top]
+                items = by_gender.get(gender)
                 header = [[Paragraph(unicode(gender_name), styles["Heading2"]), '', '', unicode(distance), '', ''], ]
                 if items:
                     self.elements.append(
@@ -263,7 +333,7 @@ class PDFReports(object):
 
     def results_team(self):
         col_width = (2 * cm, 1.5 * cm, 3 * cm, 3 * cm, 1 * cm, 2 * cm, 1 * cm, 2 * cm)
-        distances = self.competition.get_distances().filter(can_have_teams=True)
+        distances = self.get_team_distances()
         competition_index = self.processing_class.competition_index  # Get stage index
 
         team_table_style = base_table_style[:] + [
@@ -318,8 +388,8 @@ class PDFReports(object):
             self.elements.append(PageBreak())
 
     def results_team_standings(self):
-        distances = self.competition.get_distances().filter(can_have_teams=True)
-        children_count = self.primary_competition.children.count()
+        distances = self.get_team_distances()
+        children_count = len(self.primary_competition.get_stages())
         for distance in distances:
             items = TeamResultStandings.objects.filter(team__distance=distance).order_by('-points_total', '-team__is_featured', 'team__title').select_related('team')
             self.elements.append(self.header(unicode("%s komandu rezultāti" % distance)))
@@ -342,7 +412,10 @@ class PDFReports(object):
 
 
 
-    def build(self):
-        self.doc.build(self.elements, canvasmaker=PageNumCanvas)
+    def build(self, page_numbers=True):
+        """
+        Report parts that are merged later are built without page numbers, numbers are added to merged file.
+        """
+        self.doc.build(self.elements, canvasmaker=PageNumCanvas if page_numbers else canvas.Canvas)
         self.output.seek(0)
         return self.output
\ No newline at end of file
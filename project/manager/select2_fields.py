@@ -6,7 +6,7 @@ from django.utils.timezone import get_current_timezone
 from django_select2 import AutoModelSelect2Field, AutoModelSelect2MultipleField
 from core.models import User, Distance, Competition
 from registration.models import Number, Participant
-from velo.utils import load_class
+from core.processing import get_processing_class
 import datetime
 
 
@@ -25,8 +25,7 @@ class NumberMixin(object):
         group = None
         if distance_id:
             distance = Distance.objects.get(id=request.GET.get('distance_id'))
-            class_ = load_class(distance.competition.processing_class)
-            processing_class = class_(distance.competition.id)
+            processing_class = get_processing_class(competition_id=distance.competition_id)
             group = processing_class.get_group_for_number_search(distance.id, request.GET.get('gender', ''), request.GET.get('birthday', None))
 
         if search_term:
@@ -3,7 +3,7 @@ from django.conf import settings
 from django.core.mail import send_mail
 from legacy.utils import full_sync
 from registration.models import Participant
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 @celery.task
@@ -18,8 +18,7 @@ def update_results_for_result(result):
     """
     Full result recalculation in case points have changed for participant.
     """
-    class_ = load_class(result.competition.processing_class)
-    competition_class = class_(competition=result.competition)
+    competition_class = get_processing_class(competition_id=result.competition_id)
     updated = result.set_all()
     if updated:
         print 'points have been updated.'
@@ -41,4 +40,13 @@ def update_results_for_participant(participant_id):
     participant = Participant.objects.get(id=participant_id)
     results = participant.result_set.all()
     for result in results:
-        update_results_for_result(result)
\ No newline at end of file
+        update_results_for_result(result)
+
+
+@celery.task
+def build_result_report_section(competition_id, action, version, distance_id, distance_ids):
+    """
+    Renders one distance section of result report. Section finished last merges whole report.
+    """
+    from manager.pdfreports.jobs import build_section
+    build_section(competition_id, action, version, distance_id, distance_ids)
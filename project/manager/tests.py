@@ -1,3 +1,52 @@
+import datetime
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.models import Competition, Distance, User
+from manager.excels.start_list import create_standing_list, team_member_list, create_team_list
+from registration.models import Participant, Number
+from results.models import SebStandings
+from team.models import Team, Member, MemberApplication
 
-# Create your tests here.
+
+EXPORT_QUERY_BUDGET = 5
+
+
+class ExportQueryBudgetTest(TestCase):
+    """
+    Exports should run the same number of queries regardless of how many rows are exported.
+    """
+    def setUp(self):
+        self.owner = User.objects.create(email='manager@example.com')
+        self.competition = Competition.objects.create(name='Test', alias='test')
+        self.distance = Distance.objects.create(competition=self.competition, name='Sporta')
+        self.team = Team.objects.create(distance=self.distance, title='Team', owner=self.owner, country='LV')
+        self.rows = 0
+
+    def add_rows(self, count):
+        slugs = ['rider-%i' % index for index in range(self.rows, self.rows + count)]
+        Number.objects.bulk_create([Number(competition=self.competition, distance=self.distance, number=self.rows + index + 1, participant_slug=slug) for index, slug in enumerate(slugs)])
+        Participant.objects.bulk_create([Participant(competition=self.competition, distance=self.distance, slug=slug, first_name='Rider', last_name=slug,
+                                                     birthday=datetime.date(1980, 1, 1), gender='M', group='M-18', is_participating=True) for slug in slugs])
+        participants = Participant.objects.filter(slug__in=slugs)
+        SebStandings.objects.bulk_create([SebStandings(competition=self.competition, distance=self.distance, participant=participant, participant_slug=participant.slug) for participant in participants])
+
+        Member.objects.bulk_create([Member(team=self.team, first_name='Rider', last_name=slug, birthday=datetime.date(1980, 1, 1), slug=slug) for slug in slugs])
+        members = Member.objects.filter(slug__in=slugs)
+        MemberApplication.objects.bulk_create([MemberApplication(member=member, competition=self.competition, kind=MemberApplication.KIND_PARTICIPANT) for member in members])
+        self.rows += count
+
+    def count_queries(self, export):
+        export(competition=self.competition).close()  # Warm up process caches
+        with CaptureQueriesContext(connection) as context:
+            export(competition=self.competition).close()
+        return len(context)
+
+    def test_query_count_does_not_depend_on_row_count(self):
+        for export in (create_standing_list, team_member_list, create_team_list):
+            self.add_rows(3)
+            small = self.count_queries(export)
+            self.add_rows(30)
+            large = self.count_queries(export)
+            self.assertEqual(small, large, '%s runs %i queries for %i rows' % (export.__name__, large, self.rows))
+            self.assertLessEqual(large, EXPORT_QUERY_BUDGET)
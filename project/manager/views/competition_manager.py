@@ -2,21 +2,22 @@
 from __future__ import unicode_literals
 from django.contrib import messages
 from django.db.models import Sum, Count
-from django.http import HttpResponse
+from django.core.servers.basehttp import FileWrapper
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.clickjacking import xframe_options_exempt
 from django.views.generic import DetailView, TemplateView
 from core.models import Competition
 from manager.excels.insured import create_insured_list
-from manager.excels.start_list import create_start_list, create_standing_list, team_member_list, \
-    create_team_list, payment_list
+from manager.excels.start_list import create_start_list, stream_start_list_csv, create_start_list_xlsx, create_standing_list, team_member_list, \
+    create_team_list, payment_list, stream_payment_list_csv
 from manager.tables import ManageCompetitionTable
 from manager.views import ManageApplication
 from manager.views.permission_view import ManagerPermissionMixin
 from registration.models import Participant, Application
 from team.utils import match_applied_to_participants
 from velo.mixins.views import SingleTableViewWithRequest, SetCompetitionContextMixin
-from velo.utils import load_class
+from core.processing import get_processing_class
 from manager.tasks import *
 
 __all__ = [
@@ -73,8 +74,7 @@ class ManageCompetitionDetail(ManagerPermissionMixin, SetCompetitionContextMixin
     template_name = 'manager/competition_detail.html'
     def post(self, request, *args, **kwargs):
         self.competition = Competition.objects.get(id=kwargs.get('pk'))
-        class_ = load_class(self.competition.processing_class)
-        self._competition_class = class_(self.competition.id)
+        self._competition_class = get_processing_class(self.competition)
         if request.POST.get('action') == 'assign_numbers_continuously':
             self._competition_class.assign_numbers_continuously()
         elif request.POST.get('action') == 'legacy_sync':
@@ -87,6 +87,15 @@ class ManageCompetitionDetail(ManagerPermissionMixin, SetCompetitionContextMixin
             response.write(file_obj.getvalue())
             file_obj.close()
             return response
+        elif request.POST.get('action') == 'start_list_csv':
+            response = StreamingHttpResponse(stream_start_list_csv(self.competition), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = 'attachment; filename=start_list.csv'
+            return response
+        elif request.POST.get('action') == 'start_list_xlsx':
+            file_obj = create_start_list_xlsx(self.competition)
+            response = StreamingHttpResponse(FileWrapper(file_obj), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            response['Content-Disposition'] = 'attachment; filename=start_list.xlsx'
+            return response
         elif request.POST.get('action') == 'payment_list':
             file_obj = payment_list(competition=self.competition)
             response = HttpResponse(mimetype='application/vnd.ms-excel')
@@ -94,6 +103,10 @@ class ManageCompetitionDetail(ManagerPermissionMixin, SetCompetitionContextMixin
             response.write(file_obj.getvalue())
             file_obj.close()
             return response
+        elif request.POST.get('action') == 'payment_list_csv':
+            response = StreamingHttpResponse(stream_payment_list_csv(self.competition), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = 'attachment; filename=payment_list.csv'
+            return response
 
         elif request.POST.get('action') == 'create_standing_list':
             file_obj = create_standing_list(competition=self.competition)
@@ -16,7 +16,7 @@ from payment.models import Payment
 from registration.models import Participant, Application, PreNumberAssign
 from velo.mixins.views import SingleTableViewWithRequest, SetCompetitionContextMixin, RequestFormKwargsMixin, \
     CreateViewWithCompetition, UpdateViewWithCompetition
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 __all__ = [
@@ -215,11 +215,9 @@ class ManageParticipantPDF(ManagerPermissionMixin, DetailView):
 
     def get(self, *args, **kwargs):
         self.object = self.get_object()
-        if self.object.competition.processing_class:
-            _class = load_class(self.object.competition.processing_class)
-        else:
+        processing_class = get_processing_class(competition_id=self.object.competition_id)
+        if not processing_class:
             raise Http404
-        processing_class = _class(self.object.competition_id)
         file_obj = processing_class.number_pdf(participant_id=self.object.id)
         response = HttpResponse(mimetype='application/pdf')
         response['Content-Disposition'] = 'attachment; filename=%s.pdf' % self.object.slug
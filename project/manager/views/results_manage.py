@@ -1,13 +1,16 @@
+import json
 from django.contrib import messages
+from django.core.files.storage import default_storage
+from django.core.servers.basehttp import FileWrapper
 from django.core.urlresolvers import reverse
 from django.db.models import Q
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.utils.text import slugify
 from django.views.generic import UpdateView, TemplateView
 from extra_views import NamedFormsetsMixin, UpdateWithInlinesView, InlineFormSet, CreateWithInlinesView
 from core.formsets import CustomBaseInlineFormSet
 from manager.forms import ResultListSearchForm, ResultForm, ManageLapResultForm, UrlSyncForm
-from manager.pdfreports import PDFReports
+from manager.pdfreports.jobs import REPORTS, get_report, is_report_failed, request_report
 from manager.tables import ManageResultTable
 from manager.tables.tables import UrlSyncTable
 from manager.views.participant_manage import ManagerPermissionMixin
@@ -107,45 +110,58 @@ class ManageResultCreate(ManagerPermissionMixin, SetCompetitionContextMixin, Req
 
 
 class ManageResultReports(ManagerPermissionMixin, SetCompetitionContextMixin, TemplateView):
+    """
+    Reports are built in background. After report is requested page polls status until file is ready or build has failed.
+    """
     template_name = 'manager/result_reports.html'
 
+    def get(self, request, *args, **kwargs):
+        self.set_competition(kwargs.get('pk'))
+
+        version = self.get_report_version()
+        if request.GET.get('status') in REPORTS and version is not None:
+            ready = get_report(self.competition, request.GET.get('status'), version) is not None
+            failed = not ready and is_report_failed(self.competition, request.GET.get('status'), version)
+            return HttpResponse(json.dumps({'ready': ready, 'failed': failed}), content_type='application/json')
+
+        action = request.GET.get('download')
+        if action in REPORTS:
+            path = get_report(self.competition, action, version)
+            if not path:
+                raise Http404
+            response = StreamingHttpResponse(FileWrapper(default_storage.open(path, 'rb')), content_type='application/pdf')
+            response['Content-Disposition'] = 'attachment; filename=%s.pdf' % action
+            return response
+
+        return super(ManageResultReports, self).get(request, *args, **kwargs)
+
+    def get_report_version(self):
+        """
+        Results version of requested report. Report is looked up by it, because results can change while report is built.
+        """
+        try:
+            return int(self.request.GET.get('version'))
+        except (TypeError, ValueError):
+            return None
+
+    def get_context_data(self, **kwargs):
+        context = super(ManageResultReports, self).get_context_data(**kwargs)
+        if self.request.GET.get('report') in REPORTS and self.get_report_version() is not None:
+            context.update({'report': self.request.GET.get('report'), 'report_version': self.get_report_version()})
+        return context
+
     def post(self, request, *args, **kwargs):
-        pdf_class = PDFReports(competition=self.set_competition(kwargs.get('pk')))
+        self.set_competition(kwargs.get('pk'))
 
         action = request.POST.get('action')
-
-        if action == 'results_groups':
-            pdf_class.results_groups()
-        elif action == 'results_groups_top20':
-            pdf_class.results_groups(20)
-        elif action == 'results_gender':
-            pdf_class.results_gender()
-        elif action == 'results_distance':
-            pdf_class.results_distance()
-        elif action == 'results_distance_top20':
-            pdf_class.results_distance(20)
-        elif action == 'results_standings':
-            pdf_class.results_standings()
-        elif action == 'results_standings_top20':
-            pdf_class.results_standings(20)
-        elif action == 'results_standings_groups':
-            pdf_class.results_standings_groups()
-        elif action == 'results_standings_groups_top20':
-            pdf_class.results_standings_groups(20)
-        elif action == 'results_team':
-            pdf_class.results_team()
-        elif action == 'results_team_standings':
-            pdf_class.results_team_standings()
-        else:
+        if action not in REPORTS:
             raise Http404
 
-        file_obj = pdf_class.build()
-
-        response = HttpResponse(mimetype='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename=%s.pdf' % action
-        response.write(file_obj.getvalue())
-        file_obj.close()
-        return response
+        version, path = request_report(self.competition, action)
+        if path:
+            return HttpResponseRedirect('%s?download=%s&version=%i' % (request.path, action, version))
+        messages.info(request, 'Atskaite tiek veidota. Fails tiks lejupielādēts, kad būs gatavs.')
+        return HttpResponseRedirect('%s?report=%s&version=%i' % (request.path, action, version))
 
 
 class ManageUrlSyncList(ManagerPermissionMixin, SingleTableViewWithRequest):
@@ -13,7 +13,7 @@ from manager.tables.tables import ManageTeamApplyTable
 from manager.views.permission_view import ManagerPermissionMixin
 from team.models import MemberApplication, Team, Member
 from velo.mixins.views import SetCompetitionContextMixin, SingleTableViewWithRequest, RequestFormKwargsMixin
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 __all__ = [
@@ -139,8 +139,7 @@ class ManageTeamAppliedUpdate(ManagerPermissionMixin, SetCompetitionContextMixin
     def forms_valid(self, form, inlines):
         ret = super(ManageTeamAppliedUpdate, self).forms_valid(form, inlines)
 
-        class_ = load_class(self.object.distance.competition.processing_class)
-        competition_class = class_(competition_id=self.kwargs.get('pk'))
+        competition_class = get_processing_class(competition_id=int(self.kwargs.get('pk')))
         competition_class.recalculate_team_result(team=self.object)
 
         return ret
\ No newline at end of file
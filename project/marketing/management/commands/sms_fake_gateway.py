@@ -0,0 +1,64 @@
+# coding=utf-8
+from __future__ import unicode_literals
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from optparse import make_option
+import threading
+import time
+from django.core.management.base import BaseCommand
+
+
+class FakeGatewayServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    latency = 0
+    received = 0
+    lock = threading.Lock()
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive connections, the same as real gateway
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.received += 1
+            message_id = self.server.received
+        body = 'OK %i' % message_id
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Local SMS gateway used to benchmark SMS sending without sending real messages.
+    Start it and set SMS_GATEWAY = 'http://127.0.0.1:8025' in local settings.
+    """
+    option_list = BaseCommand.option_list + (
+        make_option('--port', dest='port', type='int', default=8025),
+        make_option('--latency', dest='latency', type='float', default=0.2, help='Response time in seconds'),
+    )
+
+    def handle(self, *args, **options):
+        server = FakeGatewayServer(('127.0.0.1', options.get('port')), FakeGatewayHandler)
+        server.latency = options.get('latency')
+
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        print 'Fake SMS gateway is listening on http://127.0.0.1:%i' % options.get('port')
+
+        last_count = 0
+        try:
+            while True:
+                time.sleep(1)
+                if server.received != last_count:
+                    print '%i messages received, %i per second' % (server.received, server.received - last_count)
+                    last_count = server.received
+        except KeyboardInterrupt:
+            server.shutdown()
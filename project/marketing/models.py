@@ -13,6 +13,7 @@ class SMS(models.Model):
     discount_code = models.ForeignKey('payment.DiscountCode', blank=True, null=True)
     send_out_at = models.DateTimeField()
     status = models.CharField(max_length=50, blank=True)
+    claimed_at = models.DateTimeField(blank=True, null=True, db_index=True)  # Set while message is being sent by worker
 
 
 class MailgunEmail(models.Model):
@@ -1,7 +1,11 @@
 # coding=utf-8
 from __future__ import unicode_literals  # u'' strings by default # Awesome :)
 import datetime
+from multiprocessing.pool import ThreadPool
+import threading
+import time
 from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import Count
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -14,6 +18,7 @@ from payment.models import DiscountCode
 from registration.models import Participant, Application
 from results.models import LegacyResult
 from premailer import transform
+from velo.utils import bulk_update
 
 
 # TODO: Create view, where it is possible to filter participants and send information. This is tmp solution.
@@ -270,19 +275,93 @@ def send_test():
     sms.is_processed = True
     sms.save()
 
-def send_smses():
-    smses = SMS.objects.filter(is_processed=False)[:1000]
-    for sms in smses:
-        # text = unicodedata.normalize('NFKD', sms.text).encode('ascii', 'ignore').decode('ascii')
-        # print text
+class RateLimiter(object):
+    """
+    Thread safe limiter that allows at most `rate` calls per second.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = time.time()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.time()
+            wait_for = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+SMS_CLAIM_TIMEOUT = 60 * 10  # Claimed messages that are not finished in this time are sent again
+
+
+def _claim_smses(batch_size):
+    """
+    Claims batch of unprocessed SMS rows by setting claimed_at in short transaction, so messages are sent
+    without holding row locks. Several workers can send in parallel.
+    On PostgreSQL 9.5 and newer rows locked by other workers are skipped with SKIP LOCKED, on older versions
+    worker waits until other claim is committed.
+    """
+    now = timezone.now()
+    qn = connection.ops.quote_name
+    sql = 'SELECT id FROM %s WHERE is_processed = %%s AND (claimed_at IS NULL OR claimed_at < %%s) ORDER BY id LIMIT %%s' % qn(SMS._meta.db_table)
+    if connection.vendor == 'postgresql':
+        sql += ' FOR UPDATE SKIP LOCKED' if connection.pg_version >= 90500 else ' FOR UPDATE'
+    with transaction.atomic():
+        cursor = connection.cursor()
+        cursor.execute(sql, [False, now - datetime.timedelta(seconds=SMS_CLAIM_TIMEOUT), batch_size])
+        ids = [row[0] for row in cursor.fetchall()]
+        SMS.objects.filter(id__in=ids).update(claimed_at=now)
+    return list(SMS.objects.filter(id__in=ids).order_by('id'))
+
+
+def send_smses(limit=1000):
+    """
+    Sends unprocessed SMS messages over pooled keep-alive connections with bounded concurrency.
+    Gateway rate is limited to settings.SMS_GATEWAY_RATE_LIMIT messages per second.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=settings.SMS_GATEWAY_CONCURRENCY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    limiter = RateLimiter(settings.SMS_GATEWAY_RATE_LIMIT)
+    pool = ThreadPool(settings.SMS_GATEWAY_CONCURRENCY)
+
+    def _send(sms):
         sms_obj = {
             'page': 'message/send',
             'username': settings.SMS_USERNAME,
             'password': settings.SMS_PASSWORD,
             'destinationAddress': sms.phone_number,
-            'text': sms.text,
+            'text': sms.text.encode('utf-8'),
         }
-        resp = requests.get('%s/?%s' % (settings.SMS_GATEWAY, urllib.urlencode(sms_obj)))
+        limiter.wait()
+        try:
+            resp = session.get('%s/?%s' % (settings.SMS_GATEWAY, urllib.urlencode(sms_obj)), timeout=30)
+        except requests.RequestException as e:
+            sms.response = 'ERROR: %s' % e  # Message stays unprocessed and is sent again in next run
+            sms.claimed_at = None
+            return sms
         sms.response = resp.content
         sms.is_processed = True
-        sms.save()
+        return sms
+
+    sent = 0
+    try:
+        while sent < limit:
+            smses = _claim_smses(min(settings.SMS_BATCH_SIZE, limit - sent))
+            if not smses:
+                break
+            smses = pool.map(_send, smses)
+            bulk_update(smses, ['response', 'is_processed', 'claimed_at'])
+            processed = len([sms for sms in smses if sms.is_processed])
+            sent += processed
+            if processed < len(smses):  # Gateway is not reachable, stop and retry failed messages in next run
+                break
+    finally:
+        pool.close()
+        session.close()
+    return sent
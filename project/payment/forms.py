@@ -14,7 +14,7 @@ from payment.widgets import PaymentTypeWidget, DoNotRenderWidget
 from registration.models import Application
 from velo.mixins.forms import RequestKwargModelFormMixin, GetClassNameMixin
 from django.utils.translation import ugettext, ugettext_lazy as _
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 class ApplicationPayUpdateForm(GetClassNameMixin, RequestKwargModelFormMixin, forms.ModelForm):
@@ -120,9 +120,8 @@ class ApplicationPayUpdateForm(GetClassNameMixin, RequestKwargModelFormMixin, fo
                 'accept_insurance',
                 )
 
-        if competition.processing_class:
-            _class = load_class(competition.processing_class)
-            processing = _class(competition=competition)
+        processing = get_processing_class(competition)
+        if processing:
             if hasattr(processing, 'payment_additional_checkboxes'):
                 for key, field in processing.payment_additional_checkboxes(application=self.instance):
                     self.fields[key] = field
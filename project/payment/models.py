@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 from django.contrib.contenttypes import generic
 from django.db import models
+from django.db.models import signals
 from django.utils.translation import ugettext, ugettext_lazy as _
 
 # Create your models here.
@@ -27,6 +28,14 @@ class Price(TimestampMixin, models.Model):
         return str(self.price)
 
 
+def invalidate_price_tariffs(sender, instance, **kwargs):
+    from payment.tariffs import invalidate_tariff_index
+    invalidate_tariff_index(instance.competition)
+
+signals.post_save.connect(invalidate_price_tariffs, sender=Price)
+signals.post_delete.connect(invalidate_price_tariffs, sender=Price)
+
+
 class DiscountCampaign(models.Model):
     title = models.CharField(max_length=50)
     competition = models.ForeignKey('core.Competition')
@@ -0,0 +1,98 @@
+"""
+Tariff index used to answer price checks without database queries.
+Index contains prices of competition (and of first stage for complex payment), insurances and stage count.
+It is kept in cache and deleted for whole competition tree when Price, Insurance or Competition changes.
+Registration windows are checked on every call, so index does not need to be rebuilt when time passes.
+"""
+from django.core.cache import cache
+from django.utils import timezone
+from core.models import Competition
+from payment.models import Price
+
+TARIFF_CACHE_TIMEOUT = 60 * 60
+
+
+def _cache_key(competition_id):
+    return 'tariff_index_%i' % competition_id
+
+
+class TariffIndex(object):
+    def __init__(self, competition):
+        self.competition_id = competition.id
+        self.complex_payment_enddate = competition.complex_payment_enddate
+        self.complex_discount = competition.complex_discount
+
+        children = competition.get_stages()
+        self.child_count = len(children)
+        self.first_child_id = children[0].id if children else None
+
+        self.prices = {}  # (competition_id, distance_id): [price objects ordered by price]
+        prices = Price.objects.filter(competition_id__in=[competition.id] + [child.id for child in children[:1]]).order_by('price')
+        for price in prices:
+            self.prices.setdefault((price.competition_id, price.distance_id), []).append(price)
+
+        self.insurances = dict((insurance.id, insurance) for insurance in competition.get_insurance_list())
+
+    def is_complex(self, now=None):
+        return bool(self.complex_payment_enddate and self.complex_payment_enddate > (now or timezone.now()))
+
+    def get_price(self, distance_id, year, competition_id=None, now=None):
+        now = now or timezone.now()
+        for price in self.prices.get((competition_id or self.competition_id, int(distance_id)), ()):
+            if not price.start_registering or not price.end_registering:
+                continue
+            if price.start_registering < now <= price.end_registering and price.from_year <= year <= price.till_year:
+                return price
+        return None
+
+    def get_entry_fee(self, price_obj, now=None):
+        if self.is_complex(now):
+            return round(float(price_obj.price) * self.child_count * ((100.0-self.complex_discount)/100.0), 2)
+        return float(price_obj.price)
+
+    def get_participant_fee(self, distance_id, year):
+        now = timezone.now()
+        competition_id = self.first_child_id if self.is_complex(now) else None  # Complex prices are taken from first stage.
+        price_obj = self.get_price(distance_id, year, competition_id=competition_id, now=now)
+        if not price_obj:
+            return None
+        return {
+            'price_obj': price_obj,
+            'entry_fee': self.get_entry_fee(price_obj, now),
+        }
+
+    def get_insurance_fee_from_insurance(self, insurance):
+        if self.is_complex():
+            return round(float(insurance.price) * self.child_count * ((100.0-insurance.complex_discount)/100.0), 2)
+        return float(insurance.price)
+
+    def get_insurance_fee(self, insurance_id):
+        insurance = self.insurances.get(int(insurance_id))
+        if not insurance:
+            return None
+        return {
+            'insurance_obj': insurance,
+            'insurance_fee': self.get_insurance_fee_from_insurance(insurance),
+        }
+
+
+def get_tariff_index(competition):
+    """
+    Accepts competition object or competition id. Competition is loaded only if index is not cached.
+    """
+    competition_id = competition if isinstance(competition, (int, long)) else competition.id
+    index = cache.get(_cache_key(competition_id))
+    if index is None:
+        if isinstance(competition, (int, long)):
+            competition = Competition.objects.get(id=competition_id)
+        index = TariffIndex(competition)
+        cache.set(_cache_key(competition_id), index, TARIFF_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_tariff_index(competition):
+    """
+    Stage index contains parent insurances and parent index contains stage prices, so all tree is invalidated.
+    """
+    competition_ids = Competition.objects.filter(tree_id=competition.tree_id).values_list('id', flat=True)
+    cache.delete_many([_cache_key(competition_id) for competition_id in competition_ids])
@@ -11,86 +11,35 @@ import urllib
 from core.models import Insurance, Log
 from django.utils.translation import ugettext_lazy as _
 from payment.models import Payment
+from payment.tariffs import get_tariff_index
 from registration.models import Application
 from velo.utils import SessionWHeaders
 from registration.tasks import send_success_email
 
 def get_price(competition, distance_id, year):
-    now = timezone.now()
-    prices = competition.price_set.filter(start_registering__lt=now, end_registering__gte=now, till_year__gte=year, from_year__lte=year, distance_id=distance_id).order_by('price')
-    if prices:
-        return prices[0]
-    return None
+    return get_tariff_index(competition).get_price(distance_id, year)
 
 
 def get_participant_fee(competition, distance_id, year):
-    parent_competition = None
-    if competition.complex_payment_enddate and competition.complex_payment_enddate > timezone.now():
-        parent_competition = competition
-        child_count = competition.get_children().count()
-        competition = competition.get_children()[0]
+    return get_tariff_index(competition).get_participant_fee(distance_id, year)
 
-    price_obj = get_price(competition, distance_id, year)
-    if not price_obj:
-        return None
-    if parent_competition:  # Means that complex.
-        entry_fee = round(float(price_obj.price) * child_count * ((100.0-parent_competition.complex_discount)/100.0), 2)
-    else:
-        entry_fee = float(price_obj.price)
-
-    return {
-        'price_obj': price_obj,
-        'entry_fee': entry_fee,
-    }
 
 def get_participant_fee_from_price(competition, price_obj):
-    parent_competition = None
-    if competition.complex_payment_enddate and competition.complex_payment_enddate > timezone.now():
-        parent_competition = competition
-        child_count = competition.get_children().count()
-        competition = competition.get_children()[0]
-
     if not price_obj:
         return None
-    if parent_competition:  # Means that complex.
-        entry_fee = round(float(price_obj.price) * child_count * ((100.0-parent_competition.complex_discount)/100.0), 2)
-    else:
-        entry_fee = float(price_obj.price)
-
-    return entry_fee
+    return get_tariff_index(competition).get_entry_fee(price_obj)
 
 
 def get_insurance_fee(competition, insurance_id):
     if not insurance_id:
         return None
-    try:
-        insurance = competition.get_insurances().get(id=insurance_id)
-        if competition.complex_payment_enddate and competition.complex_payment_enddate > timezone.now():
-            child_count = competition.get_children().count()
-            insurance_fee = round(float(insurance.price) * child_count * ((100.0-insurance.complex_discount)/100.0), 2)
-        else:
-            insurance_fee = float(insurance.price)
-    except Insurance.DoesNotExist:
-        return None
+    return get_tariff_index(competition).get_insurance_fee(insurance_id)
 
-    return {
-        'insurance_obj': insurance,
-        'insurance_fee': insurance_fee,
-    }
 
 def get_insurance_fee_from_insurance(competition, insurance):
     if not insurance:
         return 0.0
-    try:
-        if competition.complex_payment_enddate and competition.complex_payment_enddate > timezone.now():
-            child_count = competition.get_children().count()
-            insurance_fee = round(float(insurance.price) * child_count * ((100.0-insurance.complex_discount)/100.0), 2)
-        else:
-            insurance_fee = float(insurance.price)
-    except Insurance.DoesNotExist:
-        return 0.0
-
-    return insurance_fee
+    return get_tariff_index(competition).get_insurance_fee_from_insurance(insurance)
 
 def get_total(competition, distance_id, year, insurance_id=None):
     participant_fee = get_participant_fee(competition, distance_id, year)
@@ -214,7 +163,7 @@ def create_application_invoice(application, active_payment_type, action="send"):
     if not application.competition.complex_payment_enddate:
         competition_date = application.competition.competition_date
     else:
-        competition_date = application.competition.get_children()[0].competition_date
+        competition_date = application.competition.get_stages()[0].competition_date
     competition_datetime = datetime.datetime.combine(competition_date, datetime.time())
     now = datetime.datetime.now()
     if now + datetime.timedelta(days=7) > competition_datetime:
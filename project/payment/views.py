@@ -29,11 +29,16 @@ class CheckPriceView(JsonRequestResponseMixin, DetailView):
             insurance_id = request.POST.get('insurance', None)
             if not distance_id:
                 raise ValueError
+            distance_id = int(distance_id)
         except ValueError:
             return self.render_json_response({
                 'message': _('Please enter all details'),
             })
-        messages = get_form_message(self.get_object(), distance_id, year, insurance_id=insurance_id)
+        try:
+            # Tariff index is cached, so competition is not loaded from database on every price check.
+            messages = get_form_message(int(self.kwargs.get(self.pk_url_kwarg)), distance_id, year, insurance_id=insurance_id)
+        except Competition.DoesNotExist:
+            raise Http404
         return self.render_json_response({
             'message': ''.join(messages),
         })
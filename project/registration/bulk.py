@@ -0,0 +1,203 @@
+"""
+Bulk participant import and update.
+Does the same as Participant.save for a whole batch: slugs, groups, prices and primary numbers are calculated
+with preloaded lookups, rows are written with bulk operations and follow-ups are done once per batch.
+"""
+from django.db import transaction
+from django.template.defaultfilters import slugify
+from django.utils import timezone
+from core.models import Competition, Insurance
+from payment.models import Price
+from registration.models import Participant, Number, Application
+from registration.utils import recalculate_participant
+from core.processing import get_processing_class
+from core.slugs import make_slugs
+from velo.utils import bulk_update
+
+
+PARTICIPANT_BATCH_SIZE = 500
+
+
+class ParticipantBatch(object):
+    def __init__(self, participants):
+        self.participants = list(participants)
+        self.competitions = {}
+        self.processing_classes = {}
+        self.children = {}
+
+    def get_competition(self, competition_id):
+        if competition_id not in self.competitions:
+            self.competitions[competition_id] = Competition.objects.get(id=competition_id)
+        return self.competitions[competition_id]
+
+    def get_processing_class(self, competition_id):
+        if competition_id not in self.processing_classes:
+            self.processing_classes[competition_id] = get_processing_class(self.get_competition(competition_id))
+        return self.processing_classes[competition_id]
+
+    def get_children(self, competition_id):
+        if competition_id not in self.children:
+            self.children[competition_id] = self.get_competition(competition_id).get_stages()
+        return self.children[competition_id]
+
+    def preload(self):
+        """
+        Loads related objects used in price calculation with one query per model.
+        """
+        price_ids = set(obj.price_id for obj in self.participants if obj.price_id)
+        insurance_ids = set(obj.insurance_id for obj in self.participants if obj.insurance_id)
+        application_ids = set(obj.application_id for obj in self.participants if obj.application_id)
+        prices = Price.objects.in_bulk(price_ids) if price_ids else {}
+        insurances = Insurance.objects.in_bulk(insurance_ids) if insurance_ids else {}
+        applications = Application.objects.select_related('discount_code').in_bulk(application_ids) if application_ids else {}
+
+        for participant in self.participants:
+            participant.competition = self.get_competition(participant.competition_id)
+            if participant.price_id:
+                participant.price = prices.get(participant.price_id)
+            if participant.insurance_id:
+                participant.insurance = insurances.get(participant.insurance_id)
+            if participant.application_id:
+                participant.application = applications.get(participant.application_id)
+
+        ids = [obj.id for obj in self.participants if obj.id]
+        self.old_slugs = dict(Participant.objects.filter(id__in=ids).values_list('id', 'slug')) if ids else {}
+
+    def prepare(self):
+        now = timezone.now()
+        slugs = make_slugs((obj.first_name, obj.last_name, obj.birthday) for obj in self.participants)
+        for participant, slug in zip(self.participants, slugs):
+            participant.full_name = '%s %s' % (participant.first_name, participant.last_name)
+            participant.team_name_slug = slugify(participant.team_name.replace(' ', ''))
+            participant.slug = slug
+
+            if not participant.group and participant.is_participating:
+                processing_class = self.get_processing_class(participant.competition_id)
+                if processing_class:
+                    participant.group = processing_class.assign_group(participant.distance_id, participant.gender, participant.birthday)
+
+            if not participant.registration_dt:
+                participant.registration_dt = now
+            participant.modified = now
+
+            recalculate_participant(participant, children=self.get_children(participant.competition_id), commit=False)
+
+    def set_primary_numbers(self):
+        """
+        Primary number is the highest number assigned to participant slug, the same as Participant.numbers.
+        """
+        participants = [obj for obj in self.participants if not obj.primary_number_id and obj.is_participating]
+        if not participants:
+            return
+        competition_ids = set(cid for obj in participants for cid in obj.competition.get_ids())
+        numbers = Number.objects.filter(competition_id__in=competition_ids, participant_slug__in=set(obj.slug for obj in participants)).order_by('-number')
+        by_slug = {}
+        for number in numbers:
+            by_slug.setdefault((number.participant_slug, number.distance_id), []).append(number)
+
+        for participant in participants:
+            for number in by_slug.get((participant.slug, participant.distance_id), ()):
+                if number.competition_id not in participant.competition.get_ids():
+                    continue
+                if participant.group and participant.group[0] == 'B' and number.group != participant.group:
+                    continue
+                participant.primary_number = number
+                break
+
+    def update_slug_references(self, changed):
+        """
+        Numbers, standings and team members are moved from old slug to new slug for all changed participants at once.
+        """
+        from results.models import SebStandings
+        from team.models import MemberApplication
+
+        old_slugs = set(old_slug for participant, old_slug in changed)
+        numbers = Number.objects.filter(participant_slug__in=old_slugs)
+        changed_by_key = dict(((old_slug, participant.distance_id), participant) for participant, old_slug in changed)
+        changed_numbers = []
+        for number in numbers:
+            participant = changed_by_key.get((number.participant_slug, number.distance_id))
+            if participant and number.competition_id in participant.competition.get_ids():
+                number.participant_slug = participant.slug
+                changed_numbers.append(number)
+        bulk_update(changed_numbers, ['participant_slug'])
+
+        changed_standings = []
+        participants = dict((participant.id, participant) for participant, old_slug in changed)
+        for standing in SebStandings.objects.filter(participant_id__in=participants.keys()):
+            participant = participants.get(standing.participant_id)
+            if standing.competition_id in participant.competition.get_ids() and standing.participant_slug != participant.slug:
+                standing.participant_slug = participant.slug
+                changed_standings.append(standing)
+        bulk_update(changed_standings, ['participant_slug'])
+
+        # Because of slug change connection to team is disconnected.
+        teams = dict(((participant.team_id, old_slug), participant) for participant, old_slug in changed if participant.team_id)
+        if not teams:
+            return
+        applications = MemberApplication.objects.filter(member__team_id__in=set(key[0] for key in teams), member__slug__in=set(key[1] for key in teams)).select_related('member')
+        recalculate = {}
+        changed_applications = []
+        for appl in applications:
+            if (appl.member.team_id, appl.member.slug) not in teams:
+                continue
+            recalculate.setdefault(appl.competition_id, set()).add(appl.member.team_id)
+            appl.participant = appl.participant_unpaid = appl.participant_potential = None
+            changed_applications.append(appl)
+        bulk_update(changed_applications, ['participant', 'participant_unpaid', 'participant_potential'])
+
+        for participant in teams.values():
+            participant.team = None
+        bulk_update(teams.values(), ['team'])
+
+        for competition_id, team_ids in recalculate.items():
+            processing_class = self.get_processing_class(competition_id)
+            if not processing_class:
+                continue
+            try:
+                processing_class.recalculate_team_results(team_ids=team_ids)
+            except NotImplementedError:
+                pass
+
+    def save(self):
+        from results.finish_order import invalidate_finish_order
+        from results.helper import bump_results_version
+        from team.utils import match_participant_to_applied
+
+        self.preload()
+        self.prepare()
+        self.set_primary_numbers()
+
+        new = [obj for obj in self.participants if not obj.id]
+        existing = [obj for obj in self.participants if obj.id]
+        changed = [(obj, self.old_slugs.get(obj.id)) for obj in existing if self.old_slugs.get(obj.id) != obj.slug]
+        fields = [field.name for field in Participant._meta.concrete_fields if not field.primary_key]
+
+        with transaction.atomic():
+            Participant.objects.bulk_create(new, batch_size=PARTICIPANT_BATCH_SIZE)
+            bulk_update(existing, fields, batch_size=PARTICIPANT_BATCH_SIZE)
+            if changed:
+                self.update_slug_references(changed)
+
+        for participant, old_slug in changed:
+            match_participant_to_applied(participant)
+
+        for competition in self.competitions.values():
+            invalidate_finish_order(competition.id)
+            bump_results_version(competition)
+
+        return len(new), len(existing)
+
+
+def bulk_save_participants(participants, batch_size=PARTICIPANT_BATCH_SIZE):
+    """
+    Creates new and updates existing participants without calling Participant.save for every row.
+    Returns tuple (created count, updated count).
+    """
+    participants = list(participants)
+    created = updated = 0
+    for start in range(0, len(participants), batch_size):
+        batch_created, batch_updated = ParticipantBatch(participants[start:start + batch_size]).save()
+        created += batch_created
+        updated += batch_updated
+    return created, updated
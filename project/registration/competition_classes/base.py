@@ -6,20 +6,27 @@ import csv
 from sitetree.utils import item
 from core.models import Competition, Log, Choices
 from registration.models import Number, Participant, PreNumberAssign
+from registration.numbering import NumberPool, PassageSeeder
 from django.core.cache import cache
+from django.db import connection
 from registration.tables import ParticipantTable
-from results.helper import time_to_seconds
-from results.models import Result, DistanceAdmin, ChipScan, SebStandings, TeamResultStandings
+from results.helper import time_to_seconds, bump_results_version
+from results.models import Result, DistanceAdmin, ChipScan, SebStandings, TeamResultStandings, PointsContext
+from results.ranking import rank_results_by_distance, rank_results_by_group, rank_standings_by_distance, \
+    rank_standings_by_group
 from results.tables import ResultChildrenGroupTable, ResultGroupTable, ResultDistanceTable, \
     ResultChildrenGroupStandingTable, ResultGroupStandingTable, ResultDistanceStandingTable
 from results.tasks import send
 from team.models import MemberApplication, Team
 from django.template.defaultfilters import slugify
+from django.contrib.contenttypes.models import ContentType
+from velo.utils import bulk_update
 
 
 class CompetitionScriptBase(object):
     competition_id = None
     competition = None
+    uses_dirty_standings = False
 
     def __init__(self, competition_id=None, competition=None):
         if not competition_id and not competition:
@@ -37,25 +44,99 @@ class CompetitionScriptBase(object):
     def generate_diploma(self, result):
         raise NotImplementedError()
 
-    def apply_number_ranges(self):
+    def apply_number_ranges(self, dry_run=False):
+        """
+        Function creates all numbers from number_ranges that do not exist yet.
+        Existing numbers are loaded with one query and missing ones are created with bulk_create.
+        If dry_run is True, then nothing is created and only report is returned.
+        """
         assert self.competition_id is not None
-        ranges = self.number_ranges()
-        for distance_id in ranges:
-            numbers = ranges.get(distance_id)
+        existing = dict(((number, group), distance_id) for number, group, distance_id in Number.objects.filter(competition_id=self.competition_id).values_list('number', 'group', 'distance_id'))
+
+        missing = []
+        report = {}
+        for distance_id, numbers in self.number_ranges().items():
             for number_dict in numbers:
+                group = number_dict.get('group', '')
+                key = '%i %s' % (distance_id, group) if group else str(distance_id)
+                row = report.setdefault(key, {'existing': 0, 'create': 0, 'other_distance': 0})
                 for number in range(number_dict.get('start'), number_dict.get('end')):
-                    print Number.objects.get_or_create(competition_id=self.competition_id, group=number_dict.get('group', ''), distance_id=distance_id, number=number, defaults={'status': 1})
+                    existing_distance_id = existing.get((number, group))
+                    if existing_distance_id is None:
+                        existing[(number, group)] = distance_id
+                        missing.append(Number(competition_id=self.competition_id, group=group, distance_id=distance_id, number=number, status=1))
+                        row['create'] += 1
+                    elif existing_distance_id == distance_id:
+                        row['existing'] += 1
+                    else:
+                        row['other_distance'] += 1
+
+        for key in sorted(report):
+            row = report[key]
+            print '%s: existing %i, create %i, in other distance %i' % (key, row['existing'], row['create'], row['other_distance'])
+
+        if not dry_run:
+            Number.objects.bulk_create(missing, batch_size=500)
+        return report
+
+    def passages(self):
+        raise NotImplementedError()
+
+    def get_passage_seeding_slugs(self, distance_id):
+        """
+        Returns participant slugs in order they are seeded into passages. By default ordered by last year result.
+        """
+        participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id=distance_id, primary_number=None)
+        return participants.order_by('legacyresult__result_distance', 'created').values_list('slug', flat=True)
+
+    def seed_passages(self, distance_ids, assign_special=False, commit=True):
+        """
+        Function assigns numbers to participants by passages for provided distances.
+        If commit is False, then nothing is saved and only passage report is returned, this is used to tune passage sizes.
+        """
+        passages = self.passages()
+        pool = NumberPool(passages.keys())
+
+        if assign_special:
+            # first assign special numbers
+            pre_numbers = PreNumberAssign.objects.filter(competition=self.competition).exclude(number=None)
+            for nr in pre_numbers:
+                pool.reserve(nr.distance_id, nr.number, nr.participant_slug)
+            participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, primary_number=None, slug__in=[nr.participant_slug for nr in pre_numbers])
+            for participant in participants:
+                if (participant.distance_id, '', participant.slug) in pool.assigned:
+                    pool.assign(participant, '')
+
+        reports = {}
+        for distance_id in distance_ids:
+            seeder = PassageSeeder(self.competition, distance_id, passages.get(distance_id), self.get_passage_seeding_slugs(distance_id), pool)
+            reports[distance_id] = seeder.seed()
+            seeder.print_report()
+
+        if commit:
+            pool.save()
+            bump_results_version(self.competition)
+        return reports
+
+    def process_chip_result(self, chip_id, sendsms=True):
+        raise NotImplementedError()
 
+    def process_chip_results(self, chip_ids, sendsms=True):
+        """
+        Function processes batch of chip scans in the same order as they are provided.
+        """
+        for chip_id in chip_ids:
+            self.process_chip_result(chip_id, sendsms)
 
     def reset_cache(self):
         cache.delete('sitetrees')
         cache.delete('tree_aliases')
         # TODO: Add all other caches that are added manually
 
-    def calculate_points_distance(self, result):
+    def calculate_points_distance(self, result, context=None):
         return 0
 
-    def calculate_points_group(self, result):
+    def calculate_points_group(self, result, context=None):
         return 0
 
     def build_flat_pages(self, competition, items):
@@ -64,6 +145,8 @@ class CompetitionScriptBase(object):
 
 
 class SEBCompetitionBase(CompetitionScriptBase):
+    uses_dirty_standings = True  # Standings and team results are recalculated by recalculate_dirty_standings
+
     def __init__(self, *args, **kwargs):
         """
         Current competition have multiple stages. We need to set current stage index.
@@ -71,19 +154,12 @@ class SEBCompetitionBase(CompetitionScriptBase):
         super(SEBCompetitionBase, self).__init__(*args, **kwargs)
 
         if self.competition.level == 2:  # if class is created for parent competition, then we do not have index
-            classname = self.__class__.__name__
-            cache_key = '%s_competition_index_ids' % classname
-            child_ids = cache.get(cache_key)
-            if not child_ids:
-                child_ids = [c.id for c in self.competition.parent.get_children()]
-                cache.set(cache_key, child_ids)
-
-            self.competition_index = child_ids.index(self.competition_id) + 1
+            self.competition_index = self.competition.get_stage_index()
 
 
     def build_manager_menu(self):
         child_items = []
-        for child in self.competition.get_children():
+        for child in self.competition.get_stages():
             children = []
             children.append(item('Dalībnieki', '#', url_as_pattern=False, access_loggedin=True, in_menu=False, children=[
                 item('Pieteikt dalībnieku', 'manager:participant_create %i' % child.id, access_loggedin=True),
@@ -138,7 +214,7 @@ class SEBCompetitionBase(CompetitionScriptBase):
         ]
         self.build_flat_pages(self.competition, child_items)
         last = False
-        for child in self.competition.get_children():
+        for child in self.competition.get_stages():
             if last:
                 break
             if child.competition_date > current_date:
@@ -162,14 +238,92 @@ class SEBCompetitionBase(CompetitionScriptBase):
         return ParticipantTable
 
 
-    def recalculate_team_results(self):
+    def _team_stage_points(self, competition_ids, team_ids=None):
+        """
+        Returns dict {(team_id, competition_id): sum of best 4 riders points_distance} for all teams that have applied
+        participants in provided competitions.
+        """
+        params = [MemberApplication.KIND_PARTICIPANT] + list(competition_ids)
+        where = 'ma.kind = %%s AND ma.competition_id IN (%s)' % ', '.join(['%s'] * len(competition_ids))
+        if team_ids is not None:
+            where += ' AND m.team_id IN (%s)' % ', '.join(['%s'] * len(team_ids))
+            params.extend(team_ids)
+
+        cursor = connection.cursor()
+        if connection.vendor == 'postgresql':
+            cursor.execute("""
+SELECT ranked.team_id, ranked.competition_id, COALESCE(SUM(ranked.points_distance), 0)
+FROM (
+    SELECT m.team_id, ma.competition_id, r.points_distance,
+    row_number() OVER (PARTITION BY m.team_id, ma.competition_id ORDER BY r.points_distance DESC NULLS LAST) AS row_nr
+    FROM team_memberapplication ma
+    INNER JOIN team_member m ON ma.member_id = m.id
+    LEFT OUTER JOIN results_result r ON r.participant_id = ma.participant_id AND r.competition_id = ma.competition_id
+    WHERE %s
+) ranked
+WHERE ranked.row_nr <= 4
+GROUP BY ranked.team_id, ranked.competition_id
+""" % where, params)
+            return dict(((team_id, competition_id), points) for team_id, competition_id, points in cursor.fetchall())
+
+        cursor.execute("""
+SELECT m.team_id, ma.competition_id, r.points_distance
+FROM team_memberapplication ma
+INNER JOIN team_member m ON ma.member_id = m.id
+LEFT OUTER JOIN results_result r ON r.participant_id = ma.participant_id AND r.competition_id = ma.competition_id
+WHERE %s
+""" % where, params)
+        member_points = {}
+        for team_id, competition_id, points in cursor.fetchall():
+            member_points.setdefault((team_id, competition_id), []).append(points or 0)
+        return dict((key, sum(sorted(points, reverse=True)[:4])) for key, points in member_points.items())
+
+    def recalculate_team_results(self, team_ids=None):
         """
         Function to recalculate all team results for current competition.
+        If function is called with parent competition, then team results are recalculated for all stages at the same time.
+        Points of all teams are calculated with one query and standings are updated in bulk.
         """
-        teams = Team.objects.filter(member__memberapplication__competition=self.competition, member__memberapplication__kind=MemberApplication.KIND_PARTICIPANT).order_by('id').distinct('id')
-        for team in teams:
-            print team.id
-            self.recalculate_team_result(team=team)
+        parent = self.competition.parent if self.competition.level == 2 else self.competition
+        stage_indexes = {obj.id: index for index, obj in enumerate(parent.get_stages(), start=1)}
+        if self.competition.level == 2:
+            competition_ids = [self.competition_id]
+        else:
+            competition_ids = stage_indexes.keys()
+        if not competition_ids:
+            return
+
+        stage_points = self._team_stage_points(competition_ids, team_ids)
+        teams = dict(Team.objects.filter(id__in=set(team_id for team_id, competition_id in stage_points)).values_list('id', 'distance_id'))
+
+        standings = dict((obj.team_id, obj) for obj in TeamResultStandings.objects.filter(team_id__in=teams.keys()))
+        TeamResultStandings.objects.bulk_create([TeamResultStandings(team_id=team_id) for team_id in teams if team_id not in standings])
+        if len(standings) != len(teams):
+            standings = dict((obj.team_id, obj) for obj in TeamResultStandings.objects.filter(team_id__in=teams.keys()))
+
+        fields = ['points%i' % stage for stage in range(1, 8)] + ['points_total']
+        changed = []
+        for team_id, standing in standings.items():
+            old_values = [getattr(standing, field) for field in fields]
+            for competition_id in competition_ids:
+                if (team_id, competition_id) in stage_points:
+                    setattr(standing, 'points%i' % stage_indexes.get(competition_id), stage_points.get((team_id, competition_id)))
+
+            point_list = [getattr(standing, 'points%i' % stage) for stage in range(1, 8)]
+            if teams.get(team_id) == self.SPORTA_DISTANCE_ID:
+                point_list.pop(3)  # 4.stage is not taken because it is UCI category
+            standing.points_total = sum(filter(None, point_list))
+
+            if old_values != [getattr(standing, field) for field in fields]:
+                changed.append(standing)
+
+        bulk_update(changed, fields)
+
+        Log.objects.create(content_object=self.competition, action="Recalculated team standings", params={
+            'teams': len(standings),
+            'changed': len(changed),
+        })
+        bump_results_version(self.competition)
 
     def recalculate_team_result(self, team_id=None, team=None):
         """
@@ -202,6 +356,7 @@ class SEBCompetitionBase(CompetitionScriptBase):
         setattr(standing, 'points_total', sum(point_list))
 
         standing.save()
+        bump_results_version(self.competition)
 
         # Log information about calculated values
         Log.objects.create(content_object=team, action="Recalculated team standing", params={
@@ -248,17 +403,22 @@ class SEBCompetitionBase(CompetitionScriptBase):
             standing.set_distance_total_seconds()
         self.recalculate_standing_points(standing)  # Recalculate total points for this standing
 
-    def recalculate_standing_for_result(self, result):
+    def assign_standing_for_result(self, result):
         """
-        This function received result in input and assigned result to standing object.
-        Afterwards function calls recalculate_standing_points to recalculate points for standing
+        This function assigns result to standing object. Standing is marked for recalculation when result is saved.
         """
         if not result.standings_object:
             standing, created = SebStandings.objects.get_or_create(competition=result.competition.parent, participant_slug=result.participant.slug, distance=result.number.distance, defaults={'participant': result.participant})
             result.standings_object = standing
             result.save()
-        else:
-            standing = result.standings_object
+        return result.standings_object
+
+    def recalculate_standing_for_result(self, result):
+        """
+        This function received result in input and assigned result to standing object.
+        Afterwards function calls recalculate_standing_points to recalculate points for standing
+        """
+        standing = self.assign_standing_for_result(result)
         self.recalculate_standing(standing)
         standing.save()
 
@@ -272,50 +432,117 @@ class SEBCompetitionBase(CompetitionScriptBase):
 
     def assign_distance_and_group_places(self):
         """
-        Function iterates through all standings and assign place based on total points, total seconds and points in last stage
+        Function assigns standing place based on total points, total seconds and points in last stage
         """
-        for distance in self.competition.get_distances().exclude(id=self.BERNU_DISTANCE_ID):
-            all_standings = SebStandings.objects.filter(competition=self.competition.parent, distance=distance).order_by('-distance_total', '-distance_points7', 'distance_total_seconds')
-            for index, standing in enumerate(all_standings, start=1):
-                standing.distance_place = index
-                standing.save()
+        distance_ids = [distance.id for distance in self.competition.get_distance_list()]
+        rank_standings_by_distance(self.competition.parent_id, [distance_id for distance_id in distance_ids if distance_id != self.BERNU_DISTANCE_ID])
+        rank_standings_by_group(self.competition.parent_id, dict((distance_id, self.groups.get(distance_id, ())) for distance_id in distance_ids))
 
-        for distance in self.competition.get_distances():
-            for group in self.groups.get(distance.id, ()):
-                all_standings = SebStandings.objects.filter(competition=self.competition.parent, distance=distance, participant__group=group).order_by('-group_total', '-distance_points7', 'distance_total_seconds', )
-                for index, standing in enumerate(all_standings, start=1):
-                    standing.group_place = index
-                    standing.save()
+    def rebuild_standings(self, standing_ids=None):
+        """
+        Function recalculates stage points, total points and total seconds for all standings of competition series
+        or only for provided standings. All stage results are read in one query and only changed standings are updated.
+        """
+        parent = self.competition.parent if self.competition.level == 2 else self.competition
+        mapping = {obj.id: index for index, obj in enumerate(parent.get_stages(), start=1)}
+        stages = range(1, 8)
+
+        standings = SebStandings.objects.filter(competition=parent)
+        results = Result.objects.filter(competition_id__in=mapping.keys(), standings_content_type=ContentType.objects.get_for_model(SebStandings))
+        if standing_ids is not None:
+            standings = standings.filter(id__in=standing_ids)
+            results = results.filter(standings_object_id__in=standing_ids)
+
+        standing_results = {}
+        for result in results.values_list('standings_object_id', 'competition_id', 'points_group', 'points_distance', 'time'):
+            standing_results.setdefault(result[0], []).append(result[1:])
+
+        fields = ['group_points%i' % stage for stage in stages] + ['distance_points%i' % stage for stage in stages] + ['group_total', 'distance_total', 'distance_total_seconds']
+        changed = []
+        for standing in standings:
+            old_values = [getattr(standing, field) for field in fields]
+            for stage in stages:
+                setattr(standing, 'group_points%i' % stage, 0)
+                setattr(standing, 'distance_points%i' % stage, 0)
+
+            filled_stages = []
+            total_seconds = 0
+            for competition_id, points_group, points_distance, time in standing_results.get(standing.id, ()):
+                stage = mapping.get(competition_id)
+                if stage in filled_stages:
+                    Log.objects.create(content_object=standing, message="Multiple results in stage %i" % stage)
+                filled_stages.append(stage)
+                setattr(standing, 'group_points%i' % stage, points_group)
+                setattr(standing, 'distance_points%i' % stage, points_distance)
+                if time:
+                    total_seconds += time_to_seconds(time)
+
+            if standing.distance_id != self.BERNU_DISTANCE_ID:  # Children competition doesn't have time
+                standing.distance_total_seconds = total_seconds
+            self.recalculate_standing_points(standing)
+
+            if old_values != [getattr(standing, field) for field in fields]:
+                changed.append(standing)
+
+        bulk_update(changed, fields)
+        return changed
 
     def recalculate_standings(self):
         """
         Function recalculates all standings for current competition. Function recalculates team results also.
         """
-        if self.competition.level == 2:  # if class is called with stage competition, then recalculate all results
-            self.recalculate_standing_for_results()
+        if self.competition.level == 2:  # if class is called with stage competition, then assign results to standings
+            for result in Result.objects.filter(competition=self.competition, standings_object_id=None).select_related('participant', 'number', 'competition'):
+                self.assign_standing_for_result(result)
 
-        all_standings = SebStandings.objects.filter(competition=self.competition.parent if self.competition.level == 2 else self.competition)
-        for standing in all_standings:
-            self.recalculate_standing_points(standing)  # Recalculate standing points
-            standing.save()
+        self.rebuild_standings()
         self.assign_distance_and_group_places()  # Reassign places
 
-        if self.competition.level == 2:  # if class is called with stage competition, then recalculate all team results
-            self.recalculate_team_results()  # Recalculate team total points for current competition
-        else:
-            pass  # TODO: Create team point recalculation for all stages at the same time
+        self.recalculate_team_results()  # Recalculate team total points for current competition or for all stages
+        bump_results_version(self.competition)
+
+    def recalculate_dirty_standings(self):
+        """
+        Function recalculates only standings and team results that are marked as changed
+        and reassigns places only in affected distances and groups.
+        """
+        parent_id = self.competition.parent_id if self.competition.level == 2 else self.competition_id
+
+        standing_ids = list(SebStandings.objects.filter(competition_id=parent_id, is_dirty=True).values_list('id', flat=True))
+        team_ids = []
+        if self.competition.level == 2:  # Team results are calculated only for stage competitions
+            team_ids = list(TeamResultStandings.objects.filter(team__distance__competition_id__in=self.competition.get_ids(), is_dirty=True).values_list('team_id', flat=True))
+
+        # Flags are removed before recalculation, so changes made during recalculation are processed in next pass.
+        SebStandings.objects.filter(id__in=standing_ids).update(is_dirty=False)
+        TeamResultStandings.objects.filter(team__distance__competition_id__in=self.competition.get_ids(), team_id__in=team_ids).update(is_dirty=False)
 
+        self.rebuild_standings(standing_ids)
+
+        groups = {}
+        for distance_id, group in SebStandings.objects.filter(id__in=standing_ids).values_list('distance_id', 'participant__group'):
+            group_list = groups.setdefault(distance_id, set())
+            if group in self.groups.get(distance_id, ()):
+                group_list.add(group)
+
+        if groups:
+            rank_standings_by_distance(parent_id, [distance_id for distance_id in groups if distance_id != self.BERNU_DISTANCE_ID])
+            rank_standings_by_group(parent_id, dict((distance_id, tuple(group_list)) for distance_id, group_list in groups.items()))
+
+        if team_ids:
+            self.recalculate_team_results(team_ids)
+        bump_results_version(self.competition)
 
     def process_chip_recalculation(self):
         self.assign_distance_number()
         self.assign_group_number()
-        self.recalculate_standings()
+        self.recalculate_dirty_standings()
         from marketing.utils import send_smses
         send_smses()
 
     def process_chip_result(self, chip_id, sendsms=True):
         """
-        Function processes chip result and recalculates all standings
+        Function processes chip result and marks affected standings for recalculation
         """
         chip = ChipScan.objects.get(id=chip_id)
         distance_admin = DistanceAdmin.objects.get(competition=chip.competition, distance=chip.nr.distance)
@@ -325,18 +552,12 @@ class SEBCompetitionBase(CompetitionScriptBase):
         delta = datetime.datetime.combine(datetime.date.today(), distance_admin.zero) - datetime.datetime.combine(datetime.date.today(), datetime.time(0,0,0,0))
         result_time = (datetime.datetime.combine(datetime.date.today(), chip.time) - delta).time()
 
-        if chip.is_blocked:  # If blocked, then remove result, recalculate standings, recalculate team results
+        if chip.is_blocked:  # If blocked, then remove result. Standing and team are marked for recalculation on delete.
             results = Result.objects.filter(competition=chip.competition, number=chip.nr, time=result_time)
             if results:
                 result = results[0]
-                participant = result.participant
-                if result.standings_object:
-                    standing = result.standings_object
+                if result.standings_object_id:
                     result.delete()
-                    self.recalculate_standing(standing)  # Recalculate standings for this participant
-                    standing.save()
-                    if participant.team:  # If blocked participant was in a team, then recalculate team results.
-                        self.recalculate_team_result(team=participant.team)
                 Log.objects.create(content_object=chip, action="Chip process", message="Processed blocked chip")
             return None
         elif chip.is_processed:
@@ -367,10 +588,8 @@ class SEBCompetitionBase(CompetitionScriptBase):
                 result.set_all()
                 result.save()
 
-                # Update standings...
-                self.recalculate_standing_for_result(result)
-                if participant[0].team:
-                    self.recalculate_team_result(team=participant[0].team)
+                # Standing and team are recalculated in process_chip_recalculation
+                self.assign_standing_for_result(result)
                 if sendsms:
                     send(result.id)
 
@@ -381,21 +600,30 @@ class SEBCompetitionBase(CompetitionScriptBase):
 
 
     def recalculate_all_points(self):
+        """
+        Function recalculates average speed and points for all results of current competition.
+        Leader times and distance admins are loaded once and only changed results are updated.
+        """
         distances = [self.SPORTA_DISTANCE_ID, self.TAUTAS_DISTANCE_ID]
-        recalculate_places = False
-        results = Result.objects.filter(competition=self.competition, participant__distance_id__in=distances)
+        context = PointsContext(self.competition_id)
+        changed = []
+        standing_ids = set()
+        results = Result.objects.filter(competition=self.competition, participant__distance_id__in=distances).select_related('competition', 'participant', 'number')
         for result in results:
-            print result.id
-            if result.set_all():
-                recalculate_places = True
-                result.save()
-            self.recalculate_standing_for_result(result)
+            result._competition_class = self
+            if result.set_all(context):
+                changed.append(result)
+            standing_ids.add(self.assign_standing_for_result(result).id)
+
+        bulk_update(changed, ['avg_speed', 'points_distance', 'points_group'])
+        self.rebuild_standings(standing_ids)
 
-        if recalculate_places:
+        if changed:
             self.assign_distance_and_group_places()
             self.recalculate_team_results()
+        bump_results_version(self.competition)
 
-    def calculate_points_distance(self, result):
+    def calculate_points_distance(self, result, context=None):
         """
         Function used to calculate distance points
         """
@@ -405,14 +633,16 @@ class SEBCompetitionBase(CompetitionScriptBase):
         if result.status:  # If result has the status then that means that result is 0
             return 0
 
-        try:
-            top_result = Result.objects.filter(competition=result.competition, number__distance=result.number.distance).order_by('time')[0]
-        except IndexError:
+        if not context:
+            context = PointsContext(result.competition_id)
+
+        distance_id = result.number.distance_id
+        if not context.has_results(distance_id):
             return 1000
 
-        return math.trunc((float(math.trunc(time_to_seconds(top_result.time))) / float(math.trunc(time_to_seconds(result.time)))) * 1000)
+        return self._calculate_points(context.get_leader_time(distance_id), result.time)
 
-    def calculate_points_group(self, result):
+    def calculate_points_group(self, result, context=None):
         """
         Function used to recalculate group points
         """
@@ -422,12 +652,18 @@ class SEBCompetitionBase(CompetitionScriptBase):
         if result.status:
             return 0
 
-        try:
-            top_result = Result.objects.filter(competition=result.competition, number__distance=result.number.distance, participant__group=result.participant.group).order_by('time')[0]
-        except IndexError:
+        if not context:
+            context = PointsContext(result.competition_id)
+
+        distance_id = result.number.distance_id
+        group = result.participant.group
+        if not context.has_results(distance_id, group):
             return 1000
 
-        return math.trunc((float(math.trunc(time_to_seconds(top_result.time))) / float(math.trunc(time_to_seconds(result.time)))) * 1000)
+        return self._calculate_points(context.get_leader_time(distance_id, group), result.time)
+
+    def _calculate_points(self, leader_time, time):
+        return math.trunc((float(math.trunc(time_to_seconds(leader_time))) / float(math.trunc(time_to_seconds(time)))) * 1000)
 
     def get_result_table_class(self, distance, group=None):
         if distance.id == self.BERNU_DISTANCE_ID:  # children distance
@@ -446,25 +682,12 @@ class SEBCompetitionBase(CompetitionScriptBase):
             return ResultDistanceStandingTable
 
     def assign_distance_number(self):
-        distances = self.competition.get_distances()
-
-        for distance in distances:
-            if distance.id == self.BERNU_DISTANCE_ID:
-                continue # TODO: implement child competition place assingation
-            results = Result.objects.filter(competition=self.competition, number__distance=distance).order_by('status', 'time')  # Status is because if something is written there, then is should be at the end.
-            for index, result in enumerate(results, start=1):
-                result.result_distance = index
-                result.save()
+        distance_ids = [distance.id for distance in self.competition.get_distance_list() if distance.id != self.BERNU_DISTANCE_ID]  # TODO: implement child competition place assingation
+        rank_results_by_distance(self.competition_id, distance_ids)
 
     def assign_group_number(self):
-        distances = self.competition.get_distances()
-
-        for distance in distances:
-            for group in self.groups.get(distance.id, ()):
-                results = Result.objects.filter(competition=self.competition, number__distance=distance, participant__group=group).order_by('time')
-                for index, result in enumerate(results, start=1):
-                    result.result_group = index
-                    result.save()
+        distance_ids = [distance.id for distance in self.competition.get_distance_list()]
+        rank_results_by_group(self.competition_id, dict((distance_id, self.groups.get(distance_id, ())) for distance_id in distance_ids))
 
     def assign_numbers_continuously(self):
         self.assign_numbers(reassign=False, assign_special=False)
@@ -480,35 +703,27 @@ class SEBCompetitionBase(CompetitionScriptBase):
         else:
             parent_competition = self.competition
 
+        distance_ids = (self.SPORTA_DISTANCE_ID, self.TAUTAS_DISTANCE_ID, self.BERNU_DISTANCE_ID)
+        pool = NumberPool(distance_ids)
+
         if assign_special:
             # first assign special numbers
             pre_numbers = PreNumberAssign.objects.filter(competition=parent_competition).exclude(number=None)
             for nr in pre_numbers:
-                number = Number.objects.get(number=nr.number, competition=parent_competition)
-                print "%s - %s" % (number, nr.participant_slug)
-                number.participant_slug = nr.participant_slug
-                number.save()
+                pool.reserve(nr.distance_id, nr.number, nr.participant_slug)
 
-        print 'XXXXXXXXXXXX'
         # And now all others
-
-        participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id__in=(self.SPORTA_DISTANCE_ID, self.TAUTAS_DISTANCE_ID, self.BERNU_DISTANCE_ID), primary_number=None).order_by('created')
+        participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id__in=distance_ids, primary_number=None).order_by('created')
+        missing = 0
         for participant in participants:
             group = self.get_group_for_number_search(participant.distance_id, participant.gender, participant.birthday)
-            try:
-                number = Number.objects.get(participant_slug=participant.slug, distance=participant.distance, group=group)
-                if not participant.primary_number:
-                    participant.primary_number = number
-                    participant.save()
-            except:
-                next_numbers = Number.objects.filter(participant_slug='', distance=participant.distance, group=group).order_by('number')
-                next_number = next_numbers[0]
-                next_number.participant_slug = participant.slug
-                next_number.number_text = str(participant.created)
-                print "%s - %s" % (next_number, participant.slug)
-                next_number.save()
-                participant.primary_number = next_number
-                participant.save()
+            if not pool.assign(participant, group, number_text=str(participant.created)):
+                missing += 1
+
+        numbers_changed, participants_changed = pool.save()
+        if participants_changed:
+            bump_results_version(self.competition)  # Start list shows numbers
+        print 'Numbers assigned: %i, participants updated: %i, without free number: %i' % (numbers_changed, participants_changed, missing)
 
     def get_group_for_number_search(self, distance_id, gender, birthday):
         if not isinstance(birthday, datetime.date):
@@ -1,7 +1,6 @@
 # coding=utf-8
 from __future__ import unicode_literals
 import datetime
-from django.core.cache.utils import make_template_fragment_key
 from django.db.models import Count
 from django.template.defaultfilters import slugify
 import math
@@ -20,18 +19,16 @@ from results.tables import *
 from results.tables import ResultDistanceStandingTable, ResultRMSportsDistanceTable, ResultRMTautaDistanceTable, \
     ResultRMGroupTable, ResultRMDistanceTable
 from results.tasks import send
-from results.helper import time_to_seconds
+from results.diplomas import get_diploma
+from results.helper import time_to_seconds, bump_results_version
 from team.models import Team, MemberApplication
 from marketing.tasks import send_mailgun
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, Spacer, PageBreak
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch, cm
-from reportlab.pdfgen import canvas
-from core.pdf import get_image, getSampleStyleSheet, base_table_style, fill_page_with_image, _baseFontName, \
-    _baseFontNameB
+from core.pdf import get_image, getSampleStyleSheet, base_table_style
 from django.conf import settings
 from django.db import connection
-import os.path
 
 
 class VB2014(CompetitionScriptBase):
@@ -251,80 +248,26 @@ class VB2014(CompetitionScriptBase):
 
 
 
+    def get_passage_seeding_slugs(self, distance_id):
+        """
+        Only participants with last year result are seeded.
+        """
+        participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id=distance_id, primary_number=None).exclude(legacyresult__id=None)
+        return participants.order_by('legacyresult__result_distance', 'registration_dt').values_list('slug', flat=True)
+
     def assign_numbers(self, reassign=False, assign_special=False):
         if reassign:
             Number.objects.filter(competition=self.competition).update(participant_slug='', number_text='')
             Participant.objects.filter(competition=self.competition, is_participating=True).update(primary_number=None)
 
-        if assign_special:
-            # first assign special numbers
-            pre_numbers = PreNumberAssign.objects.filter(competition=self.competition).exclude(number=None)
-            for nr in pre_numbers:
-                number = Number.objects.get(number=nr.number, competition=self.competition)
-                print "%s - %s" % (number, nr.participant_slug)
-                number.participant_slug = nr.participant_slug
-                number.save()
-
-                participant = Participant.objects.filter(slug=nr.participant_slug, competition=self.competition, distance=number.distance, is_participating=True)
-                if participant:
-                    participant = participant[0]
-                    participant.primary_number = number
-                    participant.save()
-
-        for distance_id in (self.TAUTAS_DISTANCE_ID, ): #self.TAUTAS_DISTANCE_ID):
-
-            exclude_slugs = [obj.participant_slug for obj in PreNumberAssign.objects.filter(competition=self.competition, distance_id=distance_id).exclude(group_together=None)]
-
-            for passage_nr, passage_start, passage_end, passage_extra in self.passages().get(distance_id):
-                special_in_passage_count = PreNumberAssign.objects.filter(competition=self.competition).exclude(number=None).filter(number__gte=passage_start, number__lte=passage_end).count()
-                places = passage_end - passage_start - passage_extra + 1 - special_in_passage_count
-
-                pre_numbers = PreNumberAssign.objects.filter(competition=self.competition, number=None, distance_id=distance_id, segment=passage_nr)
-                slugs_in_passage = [obj.participant_slug for obj in pre_numbers]
-
-                # Filter those slugs that already have number:
-                final_slugs_in_passage = slugs_in_passage[:]
-                for slug in slugs_in_passage:
-                    if Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id=distance_id, slug=slug).exclude(primary_number=None).exclude(slug__in=exclude_slugs):
-                        print 'removing slug %s' % slug
-                        final_slugs_in_passage.remove(slug)
-
-                participants = Participant.objects.filter(competition_id__in=self.competition.get_ids(), is_participating=True, distance_id=distance_id, primary_number=None).exclude(legacyresult__id=None).exclude(slug__in=exclude_slugs).order_by('legacyresult__result_distance', 'registration_dt')[:places]
-                participant_slugs = [obj.slug for obj in participants]
-
-                extra_count = 0
-                slugs_in_passage = final_slugs_in_passage[:]
-                for slug in slugs_in_passage:
-                    if slug in participant_slugs:
-                        print 'FOUND %s' % slug
-                        final_slugs_in_passage.remove(slug)
-                    else:
-                        print 'not in'
-                        extra_count += 1
-
-
-                final_slugs = [obj.slug for obj in participants[:places-extra_count]] + final_slugs_in_passage
-
-                final_numbers = [nr for nr in range(passage_start, passage_end+1) if Number.objects.filter(number=nr, competition=self.competition, participant_slug='')]
-
-
-                for nr, slug in zip(final_numbers, final_slugs):
-                    print '%i - %s' % (nr, slug)
-                    number = Number.objects.get(number=nr, competition=self.competition, participant_slug='')
-                    number.participant_slug = slug
-                    number.save()
-                    participant = Participant.objects.filter(slug=slug, competition=self.competition, distance=number.distance, is_participating=True)
-                    if participant:
-                        participant = participant[0]
-                        participant.primary_number = number
-                        participant.save()
+        return self.seed_passages((self.TAUTAS_DISTANCE_ID, ), assign_special=assign_special)
 
 
     def get_group_for_number_search(self, distance_id, gender, birthday):
             return ''
 
 
-    def recalculate_team_results(self):
+    def recalculate_team_results(self, team_ids=None):
         raise NotImplementedError
         """
         Function to recalculate all team results for current competition.
@@ -516,12 +459,7 @@ AND r.id = res2.id
 
 
     def reset_cache_results(self):
-        for lang_key, lang_name in settings.LANGUAGES:
-            for distance in self.competition.get_distances():
-                cache_key = make_template_fragment_key('results_team_by_teamname', [lang_key, self.competition, distance])
-                cache.delete(cache_key)
-        for distance in self.competition.get_distances():
-            cache.delete('team_results_by_name_%i_%i' % (self.competition.id, distance.id))
+        bump_results_version(self.competition)  # Result page cache keys contain results version
 
 
     def process_unprocessed_chips(self, send_sms=False):
@@ -529,33 +467,6 @@ AND r.id = res2.id
             self.process_chip_result(chip.id, send_sms)
 
     def generate_diploma(self, result):
-        output = StringIO.StringIO()
-        path = 'results/files/diplomas/%i/%i.jpg' % (self.competition_id, result.participant.distance_id)
-
-        if not os.path.isfile(path):
-            return Exception
-
-        c = canvas.Canvas(output, pagesize=A4)
-
-        fill_page_with_image(path, c)
-
-        c.setFont(_baseFontNameB, 35)
-        c.drawCentredString(c._pagesize[0] / 2, 16.3*cm, result.participant.full_name)
-        c.setFont(_baseFontName, 25)
-        c.drawCentredString(c._pagesize[0] / 2, 15*cm, "%i.vieta" % result.result_distance)
-        c.setFont(_baseFontName, 18)
-        c.drawCentredString(c._pagesize[0] / 2, 14*cm, "Laiks: %s" % result.time.replace(microsecond=0))
-        c.drawCentredString(c._pagesize[0] / 2, 13*cm, "Vidējais ātrums: %s km/h" % result.avg_speed)
-
-        # if result.zero_time:
-        #     zero_time = datetime.datetime.combine(datetime.date.today(), result.zero_time)
-        #     delta = datetime.datetime.combine(datetime.date.today(), datetime.time(0, 0, 0)) - zero_time
-        #     zero_time = (datetime.datetime.combine(datetime.date.today(), result.time) + delta).time().replace(microsecond=0)
-        #     c.drawCentredString(c._pagesize[0] / 2, 12*cm, "Čipa laiks: %s" % zero_time)
-
-        c.showPage()
-        c.save()
-        output.seek(0)
-        return output
+        return get_diploma(result)
 
 
@@ -22,6 +22,32 @@ from django.utils.translation import ugettext
 from velo.utils import bday_from_LV_SSN
 
 
+class ApplicationFormContext(object):
+    """
+    Data shared by all participant inline forms of one application during request.
+    Distances and insurances are loaded once and price totals are memoized for clean and save phases.
+    """
+    def __init__(self, competition):
+        self.competition = competition
+        self.distances = competition.get_distance_list()
+        self.insurances = [insurance for insurance in competition.get_insurance_list() if insurance.status == Insurance.STATUS_ACTIVE]
+        self.totals = {}
+
+    @classmethod
+    def for_application(cls, application):
+        context = getattr(application, '_form_context', None)
+        if context is None:
+            context = application._form_context = cls(application.competition)
+        return context
+
+    def get_total(self, distance_id, year, insurance_id=None):
+        insurance_id = getattr(insurance_id, 'id', insurance_id)  # Restricted forms clean insurance to object
+        key = (int(distance_id), year, int(insurance_id) if insurance_id else None)
+        if key not in self.totals:
+            self.totals[key] = get_total(self.competition, distance_id, year, insurance_id)
+        return self.totals[key]
+
+
 
 class CompanyApplicationCreateForm(GetClassNameMixin, CleanEmailMixin, RequestKwargModelFormMixin, forms.ModelForm):
     change_public_url = forms.BooleanField(label=_("Reset public URL?"), help_text=_('If you reset URL, then nobody will be able to access using previous URL.'), required=False)
@@ -241,8 +267,8 @@ class ParticipantInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
             if not birthday:
                 self._errors.update({'birthday': [_("Birthday is required."), ]})
 
-        if birthday and distance and self.instance.application.payment_status == self.application.PAY_STATUS_NOT_PAYED:
-            total = get_total(self.instance.application.competition, distance.id, birthday.year, insurance)
+        if birthday and distance and self.application.payment_status == self.application.PAY_STATUS_NOT_PAYED:
+            total = self.context.get_total(distance.id, birthday.year, insurance)
             if not total:
                 self._errors.update({'distance': [_("This distance not available for this participant."), ]})
 
@@ -256,7 +282,7 @@ class ParticipantInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
         obj.insurance_id = self.cleaned_data.get('insurance')
 
         if obj.birthday and obj.distance and self.application.payment_status == self.application.PAY_STATUS_NOT_PAYED:
-            total = get_total(obj.competition, obj.distance_id, obj.birthday.year, obj.insurance_id)
+            total = self.context.get_total(obj.distance_id, obj.birthday.year, obj.insurance_id)
             if total:
                 obj.price = total.get('price_obj', None)
             else:
@@ -271,10 +297,9 @@ class ParticipantInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
         self.application = kwargs.pop('application', None)
         super(ParticipantInlineForm, self).__init__(*args, **kwargs)
 
-        competition = self.application.competition
-
-        distances = competition.get_distances()
-        insurances = competition.get_insurances().filter(status=Insurance.STATUS_ACTIVE)
+        self.context = ApplicationFormContext.for_application(self.application)
+        distances = self.context.distances
+        insurances = self.context.insurances
 
         if insurances:
             self.fields['insurance'].choices = [('', '------')] + [(insurance.id, insurance.__unicode__()) for insurance in insurances]
@@ -466,7 +491,7 @@ class CompanyParticipantInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
                 self._errors.update({'birthday': [_("Birthday is required."), ]})
 
         if birthday and distance:
-            total = get_total(self.instance.application.competition, distance.id, birthday.year)
+            total = self.context.get_total(distance.id, birthday.year)
             if not total:
                 self._errors.update({'distance': [_("This distance not available for this participant."), ]})
 
@@ -476,9 +501,8 @@ class CompanyParticipantInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
         self.application = kwargs.pop('application', None)
         super(CompanyParticipantInlineForm, self).__init__(*args, **kwargs)
 
-        competition = self.application.competition
-
-        distances = competition.get_distances()
+        self.context = ApplicationFormContext.for_application(self.application)
+        distances = self.context.distances
 
         self.fields['distance'].choices = [('', '------')] + [(distance.id, distance.__unicode__()) for distance in distances]
 
@@ -7,12 +7,13 @@ from django.db import models
 from django.template.defaultfilters import slugify
 
 import uuid
-from core.models import Choices, CustomSlug
+from core.models import Choices
+from core.slugs import make_slug
 from payment.models import Payment
 from registration.utils import recalculate_participant
-from velo.mixins.models import TimestampMixin, StatusMixin
+from velo.mixins.models import TimestampMixin, StatusMixin, CustomTrackChanges
 from django_countries.fields import CountryField
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 class Application(TimestampMixin, models.Model):
@@ -73,7 +74,11 @@ class Application(TimestampMixin, models.Model):
         self.set_final_price()
         return super(Application, self).save(*args, **kwargs)
 
-class Participant(TimestampMixin, models.Model):
+
+RESULTS_PAGE_FIELDS = ('first_name', 'last_name', 'birthday', 'slug', 'distance', 'group', 'is_competing', 'is_participating', 'primary_number', 'team', 'team_name')  # Participant fields shown on cached result pages
+
+
+class Participant(CustomTrackChanges, TimestampMixin, models.Model):
     GENDER_CHOICES = (
         ('M', _('Male')),
         ('F', _('Female')),
@@ -153,19 +158,12 @@ class Participant(TimestampMixin, models.Model):
         return '%s %s - %s %s' % (self.first_name, self.last_name, self.competition, self.distance)
 
     def set_slug(self):
-        if self.birthday:
-            try:
-                self.slug = CustomSlug.objects.get(first_name=self.first_name, last_name=self.last_name, birthday=self.birthday).slug
-            except CustomSlug.DoesNotExist:
-                self.slug = slugify('%s-%s-%i' % (self.first_name, self.last_name, self.birthday.year))
-        else:
-            self.slug = slugify('%s-%s' % (self.first_name, self.last_name))
+        self.slug = make_slug(self.first_name, self.last_name, self.birthday)
 
     def set_group(self):
         if not self.group and self.is_participating:
-            if self.competition.processing_class:
-                class_ = load_class(self.competition.processing_class)
-                processing_class = class_(self.competition_id)
+            processing_class = get_processing_class(self.competition)
+            if processing_class:
                 self.group = processing_class.assign_group(self.distance_id, self.gender, self.birthday)
 
 
@@ -189,9 +187,7 @@ class Participant(TimestampMixin, models.Model):
                 try:
                     member = team.member_set.get(slug=old_slug)
                     for appl in member.memberapplication_set.all():
-                        class_ = load_class(appl.competition.processing_class)
-                        processing_class = class_(competition=appl.competition)
-                        processing_class.recalculate_team_result(team=team)
+                        get_processing_class(appl.competition).recalculate_team_result(team=team)
                         appl.participant = None
                         appl.participant_unpaid = None
                         appl.participant_potential = None
@@ -220,12 +216,22 @@ class Participant(TimestampMixin, models.Model):
         # Recalculate totals. # TODO: This should be done when creating payment, not on any save.
         recalculate_participant(self, commit=False)
 
+        changed_values = dict(self.changed_values)  # Changes are cleared by save
+        is_new = self.pk is None
         obj = super(Participant, self).save(*args, **kwargs)
 
         if old_slug != self.slug:
             from team.utils import match_participant_to_applied
             match_participant_to_applied(self)
 
+        if 'group' in changed_values or 'is_competing' in changed_values:
+            from results.finish_order import participant_changed
+            participant_changed(self, changed_values.get('group', self.group))
+
+        if is_new or set(changed_values) & set(RESULTS_PAGE_FIELDS):
+            from results.helper import bump_results_version
+            bump_results_version(self.competition)
+
         return obj
 
     def numbers(self, slug=None):
@@ -300,13 +306,7 @@ class CompanyParticipant(TimestampMixin, models.Model):
     slug = models.SlugField(blank=True)
 
     def set_slug(self):
-        if self.birthday:
-            try:
-                self.slug = CustomSlug.objects.get(first_name=self.first_name, last_name=self.last_name, birthday=self.birthday).slug
-            except CustomSlug.DoesNotExist:
-                self.slug = slugify('%s-%s-%i' % (self.first_name, self.last_name, self.birthday.year))
-        else:
-            self.slug = slugify('%s-%s' % (self.first_name, self.last_name))
+        self.slug = make_slug(self.first_name, self.last_name, self.birthday)
 
     def save(self, *args, **kwargs):
         self.set_slug()
@@ -0,0 +1,225 @@
+"""
+Start number allocation done in memory.
+All numbers for distances are loaded once, free numbers are kept in ordered pools per (distance, group)
+and all changes are written back with bulk updates in one transaction.
+"""
+from bisect import bisect_left, bisect_right
+import sys
+from django.db import transaction
+from registration.models import Number, Participant, PreNumberAssign
+from velo.utils import bulk_update
+
+
+class FreeNumbers(object):
+    """
+    Free numbers of one (distance, group) kept sorted by number, so ranges are found and numbers are removed with bisect.
+    """
+    def __init__(self):
+        self.keys = []  # sorted (number, id)
+        self.numbers = {}  # id: Number
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, number):
+        return number.id in self.numbers
+
+    def add(self, number):
+        key = (number.number, number.id)
+        if not self.keys or self.keys[-1] < key:
+            self.keys.append(key)  # Numbers are loaded in number order
+        else:
+            self.keys.insert(bisect_left(self.keys, key), key)
+        self.numbers[number.id] = number
+
+    def remove(self, number):
+        key = (number.number, number.id)
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+            del self.numbers[number.id]
+
+    def pop_first(self):
+        number_value, number_id = self.keys.pop(0)
+        return self.numbers.pop(number_id)
+
+    def between(self, start, end):
+        start_index = bisect_left(self.keys, (start, ))
+        end_index = bisect_right(self.keys, (end, sys.maxint))
+        return [self.numbers[number_id] for number_value, number_id in self.keys[start_index:end_index]]
+
+
+class NumberPool(object):
+    def __init__(self, distance_ids):
+        self.free = {}  # (distance_id, group): FreeNumbers
+        self.assigned = {}  # (distance_id, group, participant_slug): number
+        self.by_number = {}  # (distance_id, number): [numbers with this number in different groups]
+        self.changed_numbers = {}
+        self.changed_participants = []
+
+        for number in Number.objects.filter(distance_id__in=distance_ids).order_by('number', 'id'):
+            self.by_number.setdefault((number.distance_id, number.number), []).append(number)
+            if number.participant_slug:
+                self.assigned.setdefault((number.distance_id, number.group, number.participant_slug), number)
+            else:
+                self.free.setdefault((number.distance_id, number.group), FreeNumbers()).add(number)
+
+    def _set_slug(self, number, slug, number_text=''):
+        old_key = (number.distance_id, number.group, number.participant_slug)
+        if number.participant_slug and self.assigned.get(old_key) is number:
+            del self.assigned[old_key]  # Number is taken from previous participant
+        number.participant_slug = slug
+        number.number_text = number_text
+        key = (number.distance_id, number.group, slug)
+        current = self.assigned.get(key)
+        if current is None or current.participant_slug != slug:
+            self.assigned[key] = number
+        self.changed_numbers[number.id] = number
+
+    def claim(self, number, slug, number_text=None):
+        """
+        Assigns provided number object to participant slug.
+        """
+        if not number.participant_slug:
+            free = self.free.get((number.distance_id, number.group))
+            if free:
+                free.remove(number)
+        self._set_slug(number, slug, number.number_text if number_text is None else number_text)
+        return number
+
+    def reserve(self, distance_id, number_value, slug):
+        """
+        Assigns specific number to participant slug. Used for pre-assigned numbers.
+        """
+        numbers = self.by_number.get((distance_id, number_value))
+        if not numbers:
+            return None
+        return self.claim(numbers[0], slug)
+
+    def free_between(self, distance_id, group, start, end):
+        free = self.free.get((distance_id, group))
+        return free.between(start, end) if free else []
+
+    def take(self, distance_id, group, slug, number_text=''):
+        """
+        Returns number already assigned to slug or the next free number in pool.
+        Returns None if pool is exhausted.
+        """
+        number = self.assigned.get((distance_id, group, slug))
+        if number:
+            return number
+        free = self.free.get((distance_id, group))
+        if not free:
+            return None
+        number = free.pop_first()
+        self._set_slug(number, slug, number_text)
+        return number
+
+    def assign(self, participant, group, number_text=''):
+        number = self.take(participant.distance_id, group, participant.slug, number_text)
+        if number and participant.primary_number_id != number.id:
+            participant.primary_number = number
+            self.changed_participants.append(participant)
+        return number
+
+    def save(self):
+        with transaction.atomic():
+            bulk_update(self.changed_numbers.values(), ['participant_slug', 'number_text'])
+            bulk_update(self.changed_participants, ['primary_number'])
+        return len(self.changed_numbers), len(self.changed_participants)
+
+
+class PassageSeeder(object):
+    """
+    Seeds participants into start passages (corridors) for one distance.
+    Reservations, seeding order, already numbered participants and free numbers are loaded once,
+    all passages are solved in memory and assignments are kept in NumberPool until it is saved.
+    """
+    def __init__(self, competition, distance_id, passages, seeding_slugs, pool):
+        self.competition = competition
+        self.distance_id = distance_id
+        self.passages = passages
+        self.pool = pool
+        self.report = []
+
+        participants = Participant.objects.filter(competition_id__in=competition.get_ids(), is_participating=True, distance_id=distance_id)
+        self.participants = {}  # slug: participant without number
+        self.numbered_slugs = set()
+        for participant in participants:
+            if participant.primary_number_id:
+                self.numbered_slugs.add(participant.slug)
+            elif (distance_id, '', participant.slug) in pool.assigned:  # Number is already assigned to this slug
+                pool.assign(participant, '')
+                self.numbered_slugs.add(participant.slug)
+            else:
+                self.participants.setdefault(participant.slug, participant)
+
+        self.numbers_reserved = set()
+        self.passage_slugs = {}  # passage_nr: [participant slugs]
+        excluded_slugs = set()
+        for reservation in PreNumberAssign.objects.filter(competition=competition, distance_id=distance_id).order_by('id'):
+            if reservation.number:
+                self.numbers_reserved.add(reservation.number)
+            elif reservation.segment:
+                self.passage_slugs.setdefault(reservation.segment, []).append(reservation.participant_slug)
+            if reservation.group_together:
+                excluded_slugs.add(reservation.participant_slug)
+
+        reserved_slugs = set(slug for slugs in self.passage_slugs.values() for slug in slugs)
+        self.seeding = []
+        seen = excluded_slugs | reserved_slugs
+        for slug in seeding_slugs:
+            if slug not in seen:
+                seen.add(slug)
+                self.seeding.append(slug)
+
+    def _give(self, number, slug):
+        self.pool.claim(number, slug)
+        participant = self.participants.pop(slug, None)
+        if participant:
+            self.pool.assign(participant, number.group)
+        self.numbered_slugs.add(slug)
+
+    def seed(self):
+        """
+        Returns list of passage reports.
+        Passage reservations that do not fit are moved to the next passage and reported as overflow.
+        """
+        seeding = (slug for slug in self.seeding)
+        overflow = []
+        for passage_nr, passage_start, passage_end, passage_extra in self.passages:
+            free_numbers = self.pool.free_between(self.distance_id, '', passage_start, passage_end)
+            reserved_numbers = len([nr for nr in self.numbers_reserved if passage_start <= nr <= passage_end])
+            places = min(passage_end - passage_start - passage_extra + 1 - reserved_numbers, len(free_numbers))
+
+            reserved = [slug for slug in overflow + self.passage_slugs.get(passage_nr, []) if slug not in self.numbered_slugs]
+            seeded = []
+            while len(seeded) + len(reserved) < places:
+                slug = next(seeding, None)
+                if slug is None:
+                    break
+                if slug not in self.numbered_slugs:
+                    seeded.append(slug)
+
+            slugs = seeded + reserved
+            overflow = slugs[places:]
+            for number, slug in zip(free_numbers, slugs[:places]):
+                self._give(number, slug)
+
+            self.report.append({
+                'passage': passage_nr,
+                'start': passage_start,
+                'end': passage_end,
+                'places': places,
+                'seeded': len(seeded),
+                'reserved': len(reserved),
+                'assigned': min(len(slugs), places),
+                'free': len(free_numbers) - min(len(slugs), places),
+                'overflow': len(overflow),
+            })
+        return self.report
+
+    def print_report(self):
+        print 'Distance %i' % self.distance_id
+        for row in self.report:
+            print '%(passage)3i %(start)5i-%(end)-5i places %(places)4i assigned %(assigned)4i (seeded %(seeded)i, reserved %(reserved)i) free %(free)4i overflow %(overflow)i' % row
@@ -18,8 +18,8 @@ def send_success_email(application_id):
 
     competition = application.competition
 
-    if competition.get_children():
-        competitions = competition.get_children()
+    if competition.get_stages():
+        competitions = competition.get_stages()
     else:
         competitions = (competition, )
 
@@ -1,9 +1,13 @@
 from core.models import Competition
+from velo.utils import bulk_update
+
+
+PRICE_FIELDS = ('total_entry_fee', 'total_insurance_fee', 'final_price')
 
 
 def recalculate_participant(participant, children=None, commit=True):
     if not children:
-        children = participant.competition.get_children()
+        children = participant.competition.get_stages()
 
     pre_final_price = participant.final_price
     if (not participant.price and not participant.insurance_id) or not participant.is_participating or not participant.is_paying:
@@ -33,9 +37,30 @@ def recalculate_participant(participant, children=None, commit=True):
 
 
 
-def recalculate_participant_final_payment(competition_id):
+def recalculate_participant_final_payment(competition_id, commit=True):
+    """
+    Function recalculates entry fee, insurance fee and final price for all competition participants.
+    Prices, insurances and discount campaigns are loaded together with participants and only changed rows are written.
+    Returns list of changes [(participant, {field: (old value, new value)}), ...]. If commit is False, then nothing is saved.
+    """
     competition = Competition.objects.get(id=competition_id)
-    children = competition.get_children()
+    children = competition.get_stages()
+
+    participants = competition.participant_set.all().select_related('competition', 'price', 'insurance', 'application__discount_code__campaign')
+    changes = []
+    for participant in participants:
+        old_values = dict((field, getattr(participant, field)) for field in PRICE_FIELDS)
+        recalculate_participant(participant, children, commit=False)
+        diff = {}
+        for field in PRICE_FIELDS:
+            if round(float(old_values[field]), 2) != round(float(getattr(participant, field)), 2):
+                diff[field] = (old_values[field], getattr(participant, field))
+        if diff:
+            changes.append((participant, diff))
+
+    for participant, diff in changes:
+        print '%i %s: %s' % (participant.id, participant.full_name, ', '.join('%s %s -> %.2f' % (field, old, float(new)) for field, (old, new) in sorted(diff.items())))
 
-    for participant in competition.participant_set.all().select_related('competition', ):
-        recalculate_participant(participant, children)
\ No newline at end of file
+    if commit:
+        bulk_update([participant for participant, diff in changes], PRICE_FIELDS)
+    return changes
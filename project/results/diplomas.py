@@ -0,0 +1,184 @@
+# coding=utf-8
+"""
+Diploma service.
+Background image of every distance is read once per process and in each document it is drawn as one form XObject,
+so multi page document embeds image only once. Generated diplomas are cached by result and printed values
+if they fit in one cache value. Bulk mode renders all finishers of distance with process pool into one zip or PDF.
+"""
+from __future__ import unicode_literals
+import hashlib
+from itertools import izip
+from multiprocessing import Pool
+import os
+import StringIO
+import zipfile
+from django.core.cache import cache
+from django.db import connection
+from PyPDF2 import PdfFileReader, PdfFileWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from core.pdf import get_page_image_layout, _baseFontName, _baseFontNameB
+from results.helper import RESULTS_CACHE_TIMEOUT
+from results.models import Result
+
+DIPLOMA_BACKGROUND_PATH = 'results/files/diplomas/%i/%i.jpg'
+DIPLOMA_CHUNK_SIZE = 50
+DIPLOMA_CACHE_MAX_SIZE = 900 * 1024  # Memcached does not store values larger than 1 MB
+
+
+def _cache_key(result_id, data, background):
+    """
+    Key changes only when values printed on diploma or background image change.
+    """
+    content_hash = hashlib.md5(repr((sorted(data.items()), background.path, background.mtime))).hexdigest()
+    return 'diploma_%i_%s' % (result_id, content_hash)
+
+
+class DiplomaBackground(object):
+    """
+    Background image data and page layout.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        with open(path, 'rb') as image_file:
+            self.data = image_file.read()
+        self.rotation, self.pagesize, self.position = get_page_image_layout(StringIO.StringIO(self.data), A4)
+
+
+_backgrounds = {}  # path: DiplomaBackground
+
+
+def get_background(competition_id, distance_id):
+    """
+    Returns background from process memory. Background is loaded again only if file has changed.
+    Raises OSError if distance does not have diploma background.
+    """
+    path = DIPLOMA_BACKGROUND_PATH % (competition_id, distance_id)
+    background = _backgrounds.get(path)
+    if not background or background.mtime != os.path.getmtime(path):
+        background = _backgrounds[path] = DiplomaBackground(path)
+    return background
+
+
+class DiplomaDocument(object):
+    def __init__(self, output):
+        self.canvas = canvas.Canvas(output, pagesize=A4)
+        self.forms = {}  # background path: form name
+
+    def add_page(self, background, data):
+        c = self.canvas
+        c.setPageRotation(background.rotation)
+        c.setPageSize(background.pagesize)
+
+        form_name = self.forms.get(background.path)
+        if not form_name:
+            form_name = self.forms[background.path] = 'background%i' % len(self.forms)
+            c.beginForm(form_name)
+            x, y, width, height = background.position
+            c.drawImage(ImageReader(StringIO.StringIO(background.data)), x, y, width=width, height=height, preserveAspectRatio=True)
+            c.endForm()
+        c.doForm(form_name)
+
+        c.setFont(_baseFontNameB, 35)
+        c.drawCentredString(c._pagesize[0] / 2, 16.3*cm, data.get('full_name'))
+        c.setFont(_baseFontName, 25)
+        c.drawCentredString(c._pagesize[0] / 2, 15*cm, "%i.vieta" % data.get('place'))
+        c.setFont(_baseFontName, 18)
+        c.drawCentredString(c._pagesize[0] / 2, 14*cm, "Laiks: %s" % data.get('time'))
+        c.drawCentredString(c._pagesize[0] / 2, 13*cm, "Vidējais ātrums: %s km/h" % data.get('avg_speed'))
+        c.showPage()
+
+    def save(self):
+        self.canvas.save()
+
+
+def diploma_data(result):
+    """
+    Values printed on diploma. Plain dict is passed to worker processes in bulk mode.
+    """
+    return {
+        'competition_id': result.competition_id,
+        'distance_id': result.participant.distance_id,
+        'slug': result.participant.slug,
+        'full_name': result.participant.full_name,
+        'place': result.result_distance,
+        'time': unicode(result.time.replace(microsecond=0)),
+        'avg_speed': unicode(result.avg_speed),
+    }
+
+
+def render_diplomas(items):
+    """
+    Renders list of diploma data into one PDF and returns its content.
+    """
+    output = StringIO.StringIO()
+    document = DiplomaDocument(output)
+    for data in items:
+        document.add_page(get_background(data.get('competition_id'), data.get('distance_id')), data)
+    document.save()
+    return output.getvalue()
+
+
+def get_diploma(result):
+    """
+    Returns diploma of result as StringIO. Diploma is taken from cache if its values have not changed since it was made.
+    Diplomas larger than cache value limit are rendered every time.
+    """
+    data = diploma_data(result)
+    key = _cache_key(result.id, data, get_background(data.get('competition_id'), data.get('distance_id')))
+    content = cache.get(key)
+    if content is None:
+        content = render_diplomas([data])
+        if len(content) <= DIPLOMA_CACHE_MAX_SIZE:
+            cache.set(key, content, RESULTS_CACHE_TIMEOUT)
+    return StringIO.StringIO(content)
+
+
+def _render_chunk(args):
+    """
+    Runs in worker process. Returns list of single diplomas or all chunk diplomas as one PDF.
+    """
+    items, as_zip = args
+    if as_zip:
+        return [render_diplomas([data]) for data in items]
+    return render_diplomas(items)
+
+
+def render_distance_diplomas(competition_id, distance_id, output, as_zip=False, processes=None):
+    """
+    Renders diplomas of all finishers of distance into zip (one PDF per participant) or one multi page PDF
+    written to output. Diplomas are rendered by process pool. Returns count of rendered diplomas.
+    """
+    results = Result.objects.filter(competition_id=competition_id, participant__distance_id=distance_id, status='')\
+        .exclude(time=None).exclude(result_distance=None).select_related('participant').order_by('result_distance')
+    items = [diploma_data(result) for result in results]
+
+    if items:
+        get_background(competition_id, distance_id)  # Loaded before fork, so workers share it
+
+    chunks = [items[start:start + DIPLOMA_CHUNK_SIZE] for start in range(0, len(items), DIPLOMA_CHUNK_SIZE)]
+    connection.close()  # Forked processes must not share database connection
+    pool = Pool(processes)
+    try:
+        rendered = pool.imap(_render_chunk, [(chunk, as_zip) for chunk in chunks])
+        if as_zip:
+            archive = zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED)
+            for chunk, singles in izip(chunks, rendered):  # Chunks are written as soon as they are rendered
+                for data, content in zip(chunk, singles):
+                    archive.writestr('%i_%s.pdf' % (data.get('place'), data.get('slug')), content)
+            archive.close()
+        else:
+            writer = PdfFileWriter()
+            for multi_page in rendered:
+                reader = PdfFileReader(StringIO.StringIO(multi_page))
+                for page_index in range(reader.getNumPages()):
+                    writer.addPage(reader.getPage(page_index))
+            writer.write(output)
+    finally:
+        pool.close()
+        pool.join()
+
+    return len(items)
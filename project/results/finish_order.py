@@ -0,0 +1,142 @@
+"""
+Finish order index used to find participant position in distance and in group without counting results in database.
+Index is kept in cache as separate buckets of sorted (seconds, result id) - one per distance and one per group.
+Changed result is moved inside cached buckets of its distance and group under short lock, so lookups do not
+query database. Bucket is built with one query only when it is not in cache. If bucket can not be updated,
+its version is changed, so bucket that could miss the change is never read.
+"""
+from bisect import bisect_right, insort
+import hashlib
+import sys
+import time
+from django.core.cache import cache
+from results.helper import time_to_seconds
+from results.models import Result
+
+FINISH_ORDER_TIMEOUT = 60 * 30
+FINISH_ORDER_LOCK_TIMEOUT = 10
+
+
+def _generation_key(competition_id):
+    return 'finish_order_generation_%i' % competition_id
+
+
+def _get_counter(key):
+    counter = cache.get(key)
+    if counter is None:
+        # Start from current time, so after cache eviction counter never returns to already used value.
+        counter = int(time.time() * 1000)
+        cache.add(key, counter, None)
+        counter = cache.get(key, counter)
+    return counter
+
+
+def _bump_counter(key):
+    try:
+        cache.incr(key)
+    except ValueError:  # Counter is not in cache, so new one will be started
+        pass
+
+
+def _bucket_name(competition_id, kind, value):
+    value = hashlib.md5(unicode(value).encode('utf-8')).hexdigest()  # Group names can contain symbols not allowed in cache keys
+    return 'finish_order_%i_%i_%s_%s' % (competition_id, _get_counter(_generation_key(competition_id)), kind, value)
+
+
+def _build_bucket(competition_id, kind, value):
+    results = Result.objects.filter(competition_id=competition_id, participant__is_competing=True).exclude(time=None)
+    if kind == 'distance':
+        results = results.filter(number__distance_id=value)
+    else:
+        results = results.filter(participant__group=value)
+    return sorted((time_to_seconds(result_time), result_id) for result_id, result_time in results.values_list('id', 'time'))
+
+
+def _get_bucket(competition_id, kind, value):
+    name = _bucket_name(competition_id, kind, value)
+    key = '%s_%i' % (name, _get_counter('%s_version' % name))
+    bucket = cache.get(key)
+    if bucket is None:
+        bucket = _build_bucket(competition_id, kind, value)
+        cache.set(key, bucket, FINISH_ORDER_TIMEOUT)
+    return bucket
+
+
+def _move_in_bucket(competition_id, kind, value, result_id, seconds):
+    """
+    Removes result from cached bucket and, if seconds is provided, inserts it again in its place.
+    """
+    name = _bucket_name(competition_id, kind, value)
+    version = cache.get('%s_version' % name)
+    if version is None:
+        return  # Bucket was not built since last cache eviction
+
+    lock_key = '%s_lock' % name
+    if not cache.add(lock_key, True, FINISH_ORDER_LOCK_TIMEOUT):
+        _bump_counter('%s_version' % name)  # Bucket is changed by other process, so it is built again on next lookup
+        return
+    try:
+        key = '%s_%i' % (name, version)
+        bucket = cache.get(key)
+        if bucket is None:
+            _bump_counter('%s_version' % name)  # Bucket could be being built from data without this change
+            return
+        bucket = [item for item in bucket if item[1] != result_id]
+        if seconds is not None:
+            insort(bucket, (seconds, result_id))
+        cache.set(key, bucket, FINISH_ORDER_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+
+def _drop_bucket(competition_id, kind, value):
+    _bump_counter('%s_version' % _bucket_name(competition_id, kind, value))
+
+
+def update_finish_order(result, deleted=False, created=False):
+    """
+    Moves saved or deleted result in cached buckets of its distance and group.
+    Nothing is done if time, number and participant of result are not changed.
+    """
+    changed_fields = result.changed_values
+    if not deleted and not created and not set(changed_fields) & set(('time', 'number', 'participant')):
+        return
+
+    if 'number' in changed_fields or 'participant' in changed_fields:
+        # Result is moved to other participant or number. Buckets of previous one are not known, so distance and
+        # group buckets of competition are built again.
+        _bump_counter(_generation_key(result.competition_id))
+        return
+
+    seconds = None
+    if not deleted and result.participant.is_competing and result.time is not None:
+        seconds = time_to_seconds(result.time)
+    _move_in_bucket(result.competition_id, 'distance', result.number.distance_id, result.id, seconds)
+    _move_in_bucket(result.competition_id, 'group', result.participant.group, result.id, seconds)
+
+
+def participant_changed(participant, old_group):
+    """
+    Drops buckets that contain results of participant whose group or competing status is changed.
+    """
+    _drop_bucket(participant.competition_id, 'distance', participant.distance_id)
+    _drop_bucket(participant.competition_id, 'group', old_group)
+    _drop_bucket(participant.competition_id, 'group', participant.group)
+
+
+def invalidate_finish_order(competition_id):
+    """
+    Drops all buckets of competition. Used after bulk changes that are saved without signals.
+    """
+    _bump_counter(_generation_key(competition_id))
+
+
+def get_finish_position(result):
+    """
+    Returns tuple (distance position, group position) for provided result.
+    Results with the same time share the same position, the same as counting results with time less or equal.
+    """
+    seconds = time_to_seconds(result.time)
+    distance_position = bisect_right(_get_bucket(result.competition_id, 'distance', result.number.distance_id), (seconds, sys.maxint))
+    group_position = bisect_right(_get_bucket(result.competition_id, 'group', result.participant.group), (seconds, sys.maxint))
+    return distance_position, group_position
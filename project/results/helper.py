@@ -1,5 +1,51 @@
 import datetime
+import time
+from django.core.cache import cache
+
+
+RESULTS_CACHE_TIMEOUT = 60 * 60 * 24  # Pages are refreshed by results version, timeout only frees memory.
 
 
 def time_to_seconds(time):
-    return (datetime.datetime.combine(datetime.datetime.today(), time) - datetime.datetime.combine(datetime.datetime.today(), datetime.time())).total_seconds()
\ No newline at end of file
+    return (datetime.datetime.combine(datetime.datetime.today(), time) - datetime.datetime.combine(datetime.datetime.today(), datetime.time())).total_seconds()
+
+
+def _results_version_key(competition_id):
+    return 'results_version_%i' % competition_id
+
+
+def get_results_version(competition_id):
+    """
+    Returns results version of competition. Version is included in cache keys of result pages.
+    """
+    version = cache.get(_results_version_key(competition_id))
+    if version is None:
+        # Start from current time, so after cache eviction version never returns to already used value.
+        version = int(time.time() * 1000)
+        cache.add(_results_version_key(competition_id), version, None)
+        version = cache.get(_results_version_key(competition_id), version)
+    return version
+
+
+def bump_results_version(competition=None, include_children=False, competition_id=None):
+    """
+    Changes results version of competition and its parent competition, so all cached result pages are refreshed.
+    If include_children is set, then versions of all child competitions are changed as well.
+    Competition can be provided by id, then it is taken from hierarchy snapshot without query.
+    """
+    if competition is None:
+        from core.hierarchy import get_hierarchy
+        hierarchy = get_hierarchy()
+        if competition_id in hierarchy:
+            competition = hierarchy.competitions[competition_id]
+        else:
+            from core.models import Competition
+            competition = Competition.objects.get(id=competition_id)
+    competition_ids = set(competition.get_ids())
+    if include_children:
+        competition_ids.update(competition.get_all_children_ids() or ())
+    for competition_id in competition_ids:
+        try:
+            cache.incr(_results_version_key(competition_id))
+        except ValueError:
+            cache.set(_results_version_key(competition_id), int(time.time() * 1000), None)
@@ -0,0 +1,18 @@
+# coding=utf-8
+from __future__ import unicode_literals
+from django.core.management.base import BaseCommand
+from results.diplomas import render_distance_diplomas
+
+
+class Command(BaseCommand):
+    args = '<competition_id> <distance_id> <filename.pdf|filename.zip>'
+    help = 'Renders diplomas of all distance finishers into one PDF or zip.'
+
+    def handle(self, *args, **options):
+        if len(args) != 3:
+            return 'ERROR'
+        competition_id, distance_id, filename = int(args[0]), int(args[1]), args[2]
+
+        with open(filename, 'wb') as output:
+            count = render_distance_diplomas(competition_id, distance_id, output, as_zip=filename.endswith('.zip'))
+        print 'Rendered %i diplomas into %s' % (count, filename)
@@ -12,9 +12,10 @@ from django.utils.translation import ugettext_lazy as _
 import math
 import uuid
 from core.models import Log
-from results.helper import time_to_seconds
-from velo.utils import load_class
+from results.helper import time_to_seconds, bump_results_version
+from core.processing import get_processing_class
 from save_the_change.mixins import SaveTheChange
+from velo.mixins.models import CustomTrackChanges
 
 
 def _get_upload_path(instance, filename):
@@ -106,6 +107,20 @@ class UrlSync(PeriodicTask):
     url = models.CharField(max_length=255)
     current_line = models.IntegerField(default=0)
 
+    # Position inside remote file, used to download only newly appended data.
+    current_offset = models.BigIntegerField(default=0)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+
+    def reset_position(self):
+        """
+        Start reading remote file from the beginning. Used when remote file is truncated or rotated.
+        """
+        self.current_line = 0
+        self.current_offset = 0
+        self.etag = ''
+        self.last_modified = ''
+
     def save(self, *args, **kwargs):
         self.name = "Sync_%f" % time.time()
         self.task = "results.tasks.fetch_results"
@@ -136,13 +151,53 @@ class DistanceAdmin(models.Model):
     distance_actual = models.IntegerField(blank=True, null=True)
 
 
+class PointsContext(object):
+    """
+    Distance admin objects and leader times of one competition.
+    Loaded once per calculation run, so points can be calculated without additional queries for every result.
+    """
+    def __init__(self, competition_id):
+        self.competition_id = competition_id
+        self._distance_admins = None
+        self._leader_times = None
+
+    def get_distance_admin(self, distance_id):
+        if self._distance_admins is None:
+            self._distance_admins = {obj.distance_id: obj for obj in DistanceAdmin.objects.filter(competition_id=self.competition_id)}
+        try:
+            return self._distance_admins[distance_id]
+        except KeyError:
+            raise DistanceAdmin.DoesNotExist()
+
+    def _load_leader_times(self):
+        self._leader_times = {}
+        for distance_id, group, time in Result.objects.filter(competition_id=self.competition_id).values_list('number__distance_id', 'participant__group').annotate(models.Min('time')).order_by():
+            self._leader_times[(distance_id, group)] = time
+            best_time = self._leader_times.get((distance_id, None))
+            if best_time is None or (time is not None and time < best_time):
+                self._leader_times[(distance_id, None)] = time
+
+    def has_results(self, distance_id, group=None):
+        if self._leader_times is None:
+            self._load_leader_times()
+        return (distance_id, group) in self._leader_times
+
+    def get_leader_time(self, distance_id, group=None):
+        """
+        Returns best time in distance or in distance group if group is provided.
+        """
+        if self._leader_times is None:
+            self._load_leader_times()
+        return self._leader_times.get((distance_id, group))
+
+
 class LapResult(models.Model):
     result = models.ForeignKey('results.Result')
     index = models.IntegerField(default=0, db_index=True)
     time = models.TimeField(_('Time'), blank=True, null=True)
 
 
-class Result(models.Model):
+class Result(CustomTrackChanges, models.Model):
     STATUSES = (
         ('DSQ', 'DSQ'),
         ('DNS', 'DNS'),
@@ -197,10 +252,13 @@ class Result(models.Model):
     #     else:
     #         self.loses_group = '00:00:00'
 
-    def set_avg_speed(self):
+    def set_avg_speed(self, context=None):
         avg_speed = self.avg_speed
         if self.time:
-            admin = DistanceAdmin.objects.get(competition=self.competition, distance=self.number.distance)
+            if context:
+                admin = context.get_distance_admin(self.number.distance_id)
+            else:
+                admin = DistanceAdmin.objects.get(competition=self.competition, distance=self.number.distance)
             seconds = datetime.timedelta(hours=self.time.hour, minutes=self.time.minute, seconds=self.time.second).seconds
             self.avg_speed = round((float(admin.distance_actual) / float(seconds))*3.6, 1)
             if avg_speed != self.avg_speed:
@@ -209,30 +267,31 @@ class Result(models.Model):
 
     def get_competition_class(self):
         if not self._competition_class:
-            class_ = load_class(self.competition.processing_class)
-            self._competition_class = class_(self.competition.id)
+            self._competition_class = get_processing_class(competition_id=self.competition_id)
         return self._competition_class
 
-    def set_points_distance(self):
+    def set_points_distance(self, context=None):
         points_distance = self.points_distance
-        self.points_distance = self.get_competition_class().calculate_points_distance(self)
+        self.points_distance = self.get_competition_class().calculate_points_distance(self, context)
         if points_distance != self.points_distance:
             return True
         return False
 
-    def set_points_group(self):
+    def set_points_group(self, context=None):
         points_group = self.points_group
-        self.points_group = self.get_competition_class().calculate_points_group(self)
+        self.points_group = self.get_competition_class().calculate_points_group(self, context)
         if points_group != self.points_group:
             return True
         return False
 
-    def set_all(self):
+    def set_all(self, context=None):
         # self.set_loses_distance()
         # self.set_loses_group()
-        avg = self.set_avg_speed()
-        pd = self.set_points_distance()
-        pg = self.set_points_group()
+        if not context:
+            context = PointsContext(self.competition_id)
+        avg = self.set_avg_speed(context)
+        pd = self.set_points_distance(context)
+        pg = self.set_points_group(context)
         if avg or pd or pg:
             return True  # if any of variables is updated, then return true
         return False
@@ -286,6 +345,8 @@ class SebStandings(SaveTheChange, models.Model):
     distance_total_seconds = models.FloatField(blank=True, null=True)
     distance_place = models.IntegerField(blank=True, null=True)
 
+    is_dirty = models.BooleanField(default=False, db_index=True)  # Set when any of results is changed, standing should be recalculated.
+
     @property
     def results(self):
         ctype = ContentType.objects.get_for_model(self.__class__)
@@ -293,7 +354,7 @@ class SebStandings(SaveTheChange, models.Model):
 
     def set_points(self):
         stages = [1, 2, 3, 4, 5, 6, 7]
-        mapping = {obj.id: index for index, obj in enumerate(self.competition.get_children(), start=1)}
+        mapping = {obj.id: index for index, obj in enumerate(self.competition.get_stages(), start=1)}
 
         results = self.results
 
@@ -327,4 +388,45 @@ class TeamResultStandings(SaveTheChange, models.Model):
     points4 = models.IntegerField('4.', blank=True, null=True, db_index=True)
     points5 = models.IntegerField('5.', blank=True, null=True, db_index=True)
     points6 = models.IntegerField('6.', blank=True, null=True, db_index=True)
-    points7 = models.IntegerField('7.', blank=True, null=True, db_index=True)
\ No newline at end of file
+    points7 = models.IntegerField('7.', blank=True, null=True, db_index=True)
+
+    is_dirty = models.BooleanField(default=False, db_index=True)  # Set when any of team member results is changed.
+
+
+RESULT_STANDINGS_FIELDS = ('time', 'status', 'points_group', 'points_distance', 'standings_object_id', 'participant')
+
+
+def mark_result_standings_dirty(sender, instance, **kwargs):
+    """
+    Marks standing and team of changed or deleted result for recalculation.
+    Nothing is done if result is saved without changes in fields that affect standings.
+    """
+    from registration.models import Participant
+
+    is_deleted = kwargs.get('signal') is signals.post_delete
+    if not is_deleted and not kwargs.get('created') and not set(instance.changed_values) & set(RESULT_STANDINGS_FIELDS):
+        return
+
+    bump_results_version(competition_id=instance.competition_id)
+
+    processing_class = get_processing_class(competition_id=instance.competition_id)
+    if not getattr(processing_class, 'uses_dirty_standings', False):  # Dirty flags are not processed by this competition
+        return
+
+    if instance.standings_object_id:
+        SebStandings.objects.filter(id=instance.standings_object_id).update(is_dirty=True)
+
+    team_id = Participant.objects.filter(id=instance.participant_id).values_list('team_id', flat=True).first()
+    if team_id and not TeamResultStandings.objects.filter(team_id=team_id).update(is_dirty=True):
+        TeamResultStandings.objects.create(team_id=team_id, is_dirty=True)
+
+signals.post_save.connect(mark_result_standings_dirty, sender=Result)
+signals.post_delete.connect(mark_result_standings_dirty, sender=Result)
+
+
+def update_result_finish_order(sender, instance, **kwargs):
+    from results.finish_order import update_finish_order
+    update_finish_order(instance, deleted=(kwargs.get('signal') is signals.post_delete), created=kwargs.get('created', False))
+
+signals.post_save.connect(update_result_finish_order, sender=Result)
+signals.post_delete.connect(update_result_finish_order, sender=Result)
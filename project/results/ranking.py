@@ -0,0 +1,110 @@
+"""
+Set based place assignment for results and standings.
+On PostgreSQL places are assigned with one window function UPDATE per scope,
+on other databases places are calculated in python and written with bulk update.
+"""
+from django.db import connection
+from registration.models import Participant, Number
+from results.models import Result, SebStandings
+from velo.utils import bulk_update
+
+
+RESULT_DISTANCE_ORDER = ('status', 'time')  # Status is because if something is written there, then is should be at the end.
+RESULT_GROUP_ORDER = ('time', )
+STANDING_DISTANCE_ORDER = ('-distance_total', '-distance_points7', 'distance_total_seconds')
+STANDING_GROUP_ORDER = ('-group_total', '-distance_points7', 'distance_total_seconds')
+
+
+def _order_sql(order_by):
+    qn = connection.ops.quote_name
+    return ', '.join('x.%s DESC' % qn(field[1:]) if field[0] == '-' else 'x.%s' % qn(field) for field in order_by)
+
+
+def _rank(model, place_field, competition_id, order_by, distance_column, distance_ids=None, groups=None):
+    """
+    Assigns row number based on order_by to place_field.
+    If groups are provided ({distance_id: (group, ...)}), then rows are partitioned by distance and participant group,
+    otherwise rows are partitioned by distance.
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    place_column = qn(place_field)
+    group_column = 'p.%s' % qn('group')
+
+    joins = 'INNER JOIN %s p ON x.participant_id = p.id' % qn(Participant._meta.db_table)
+    if distance_column == 'nr.distance_id':
+        joins += ' INNER JOIN %s nr ON x.number_id = nr.id' % qn(Number._meta.db_table)
+
+    params = [competition_id]
+    if groups is not None:
+        scopes = []
+        for distance_id, group_list in groups.items():
+            if not group_list:
+                continue
+            scopes.append('(%s = %%s AND %s IN (%s))' % (distance_column, group_column, ', '.join(['%s'] * len(group_list))))
+            params.append(distance_id)
+            params.extend(group_list)
+        partition = '%s, %s' % (distance_column, group_column)
+    else:
+        distance_ids = list(distance_ids or ())
+        scopes = ['%s IN (%s)' % (distance_column, ', '.join(['%s'] * len(distance_ids)))] if distance_ids else []
+        params.extend(distance_ids)
+        partition = distance_column
+
+    if not scopes:
+        return
+
+    where = 'x.competition_id = %%s AND (%s)' % ' OR '.join(scopes)
+    cursor = connection.cursor()
+
+    if connection.vendor == 'postgresql':
+        cursor.execute("""
+UPDATE %(table)s t
+SET %(place)s = ranked.place
+FROM (
+    SELECT x.id, row_number() OVER (PARTITION BY %(partition)s ORDER BY %(order)s) AS place
+    FROM %(table)s x
+    %(joins)s
+    WHERE %(where)s
+) ranked
+WHERE t.id = ranked.id AND t.%(place)s IS DISTINCT FROM ranked.place
+""" % {'table': table, 'place': place_column, 'partition': partition, 'order': _order_sql(order_by), 'joins': joins, 'where': where}, params)
+        return
+
+    cursor.execute("""
+SELECT x.id, x.%(place)s, %(partition)s
+FROM %(table)s x
+%(joins)s
+WHERE %(where)s
+ORDER BY %(partition)s, %(order)s
+""" % {'table': table, 'place': place_column, 'partition': partition, 'order': _order_sql(order_by), 'joins': joins, 'where': where}, params)
+
+    changed = []
+    last_partition = None
+    index = 0
+    for row in cursor.fetchall():
+        if row[2:] != last_partition:
+            last_partition = row[2:]
+            index = 0
+        index += 1
+        if row[1] != index:
+            obj = model(id=row[0])
+            setattr(obj, place_field, index)
+            changed.append(obj)
+    bulk_update(changed, [place_field])
+
+
+def rank_results_by_distance(competition_id, distance_ids):
+    _rank(Result, 'result_distance', competition_id, RESULT_DISTANCE_ORDER, 'nr.distance_id', distance_ids=distance_ids)
+
+
+def rank_results_by_group(competition_id, groups):
+    _rank(Result, 'result_group', competition_id, RESULT_GROUP_ORDER, 'nr.distance_id', groups=groups)
+
+
+def rank_standings_by_distance(competition_id, distance_ids):
+    _rank(SebStandings, 'distance_place', competition_id, STANDING_DISTANCE_ORDER, 'x.distance_id', distance_ids=distance_ids)
+
+
+def rank_standings_by_group(competition_id, groups):
+    _rank(SebStandings, 'group_place', competition_id, STANDING_GROUP_ORDER, 'x.distance_id', groups=groups)
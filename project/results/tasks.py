@@ -7,7 +7,6 @@ from django.core.mail import send_mail
 from django.utils.translation import ugettext_lazy as _
 import requests
 import time
-import StringIO
 import unicodedata
 import urllib
 import uuid
@@ -16,8 +15,9 @@ from marketing.models import SMS
 from marketing.utils import send_smses
 
 from registration.models import Number
+from results.finish_order import get_finish_position
 from results.models import Result, UrlSync, ChipScan
-from velo.utils import load_class
+from core.processing import get_processing_class
 import traceback
 from django.utils import timezone
 
@@ -55,10 +55,9 @@ def send_test_sms():
 @task()
 def send(result_id):
     send_out = timezone.now()
-    result = Result.objects.get(id=result_id)
+    result = Result.objects.select_related('number', 'participant').get(id=result_id)
 
-    distance_result = Result.objects.filter(competition=result.competition, number__distance=result.number.distance, time__lte=result.time).exclude(time=None).exclude(participant__is_competing=False).count()
-    group_result = Result.objects.filter(competition=result.competition, participant__group=result.participant.group, time__lte=result.time).exclude(time=None).exclude(participant__is_competing=False).count()
+    distance_result, group_result = get_finish_position(result)
 
     sms_text = 'SEB MTB pagaidu rez nr. %i laiks %s, %i.vieta grupa %s, vieta kopa %i' % (result.number.number, str(result.time.replace(microsecond=0)), group_result, result.participant.group, distance_result)
     # first_name = unicodedata.normalize('NFKD', result.participant.first_name).encode('ascii', 'ignore').decode('ascii')
@@ -93,48 +92,191 @@ def send(result_id):
     return True
 
 
+CHIP_FILE_CHUNK_SIZE = 16 * 1024
+
+
+class ChipFileReader(object):
+    """
+    Reads chip file response as a stream and yields only complete lines.
+    Last line without line ending is left for next run, because timing software could be still writing it.
+    """
+    def __init__(self, resp, skip_bytes=0):
+        self.resp = resp
+        self.skip_bytes = skip_bytes
+        self.bytes_read = 0
+        self.bytes_consumed = 0
+
+    def __iter__(self):
+        buf = b''
+        for chunk in self.resp.iter_content(chunk_size=CHIP_FILE_CHUNK_SIZE):
+            self.bytes_read += len(chunk)
+            buf += chunk
+            lines = buf.split(b'\n')
+            buf = lines.pop()
+            for line in lines:
+                self.bytes_consumed += len(line) + 1
+                if self.bytes_consumed <= self.skip_bytes:
+                    continue
+                yield line.decode('utf-8', 'ignore')
+
+    @property
+    def is_truncated(self):
+        """
+        Remote file is shorter than already processed part - file is truncated or rotated.
+        """
+        return self.bytes_read < self.skip_bytes
+
+
+def _request_chip_file(url_data):
+    """
+    Requests only data that is appended after last processed byte.
+    Returns tuple (response, start_offset) or (None, None) if there is nothing to process.
+    """
+    headers = {'Accept-Encoding': 'identity'}  # Byte ranges should point to original file, not to compressed one.
+    if url_data.current_offset:
+        # Appending changes ETag and Last-Modified, so they are not used as range validators.
+        # Truncated or rotated file is detected by file size being smaller than our offset.
+        headers['Range'] = 'bytes=%i-' % url_data.current_offset
+    else:
+        if url_data.etag:
+            headers['If-None-Match'] = url_data.etag
+        if url_data.last_modified:
+            headers['If-Modified-Since'] = url_data.last_modified
+
+    resp = requests.get(url_data.url, headers=headers, stream=True)
+
+    if resp.status_code == 304:  # Not modified
+        resp.close()
+        return None, None
+    elif resp.status_code == 416:  # Requested range not satisfiable - nothing is appended or file is shorter than our offset.
+        resp.close()
+        content_range = resp.headers.get('content-range', '')  # bytes */2000
+        try:
+            file_size = int(content_range.split('/')[1])
+        except (IndexError, ValueError):
+            file_size = None
+        if file_size is None or file_size >= url_data.current_offset:
+            return None, None
+        Log.objects.create(content_object=url_data, action="Chip file truncated", params={
+            'current_offset': url_data.current_offset,
+            'current_line': url_data.current_line,
+        })
+        url_data.reset_position()
+        return _request_chip_file(url_data)
+    elif resp.status_code == 206:
+        content_range = resp.headers.get('content-range', '')  # bytes 1000-1999/2000
+        try:
+            start_offset = int(content_range.split(' ')[1].split('-')[0])
+        except (IndexError, ValueError):
+            start_offset = url_data.current_offset
+        if start_offset > url_data.current_offset:
+            resp.close()
+            return None, None  # Range is not the one we asked for, next run will try again.
+        return resp, start_offset
+    elif resp.status_code == 200:  # Full file. Either first request or server doesn't support ranges.
+        return resp, 0  # Already processed bytes are skipped by reader, shorter file is detected by it as well.
+
+    resp.close()
+    return None, None
+
+
+def ingest_chip_lines(competition, lines):
+    """
+    Stores chip file lines as ChipScan objects using bulk queries.
+    Returns ids of unprocessed scans with known number in the same order as in chip file.
+    """
+    scans = []
+    for line in lines:
+        print line
+        if len(line.strip()) == 0:
+            print 'empty line'
+            continue
+        number, time_text = line.strip().split(',')
+        if number == '0':
+            print 'skipping 0 number'
+            continue
+        scans.append((number, time_text))
+
+    if not scans:
+        return []
+
+    numbers = dict(Number.objects.filter(competition_id__in=competition.get_ids(), group='').values_list('number', 'id'))
+
+    def get_number_id(number):
+        try:
+            return numbers.get(int(number.strip()))
+        except ValueError:
+            return None
+
+    existing = dict(((nr_text, time_text), (scan_id, nr_id)) for scan_id, nr_text, time_text, nr_id in ChipScan.objects.filter(competition=competition, nr_text__in=set(number for number, time_text in scans)).values_list('id', 'nr_text', 'time_text', 'nr_id'))
+
+    new_scans = []
+    for key in scans:
+        number, time_text = key
+        if key in existing:
+            scan_id, nr_id = existing.get(key)
+            if not nr_id and get_number_id(number):  # Number is created after scan was stored
+                ChipScan.objects.filter(id=scan_id).update(nr=get_number_id(number))
+            continue
+        number_id = get_number_id(number)
+        existing[key] = (None, number_id)
+        if not number_id:
+            print 'number not found'
+        new_scans.append(ChipScan(competition=competition, nr_text=number, time_text=time_text, time=time_text, nr_id=number_id))
+
+    ChipScan.objects.bulk_create(new_scans)
+
+    order = dict((key, index) for index, key in enumerate(scans))
+    unprocessed = ChipScan.objects.filter(competition=competition, nr_text__in=set(number for number, time_text in scans), is_processed=False).exclude(nr=None).values_list('id', 'nr_text', 'time_text')
+    unprocessed = [obj for obj in unprocessed if (obj[1], obj[2]) in order]
+    unprocessed.sort(key=lambda obj: (order.get((obj[1], obj[2])), obj[0]))
+    return [obj[0] for obj in unprocessed]
+
+
 @task()
 def fetch_results(_id):
     url_data = UrlSync.objects.get(id=_id)
 
-    processed_line = url_data.current_line
-
-    class_ = load_class(url_data.competition.processing_class)
-    processing_class = class_(url_data.competition.id)
+    processing_class = get_processing_class(competition_id=url_data.competition_id)
 
     try:
-        resp = requests.get(url_data.url)
+        resp, start_offset = _request_chip_file(url_data)
 
-        if resp.status_code != 200:
+        if not resp:
             return
 
-        buf = StringIO.StringIO(resp.content)
-        file_lines = tuple(buf.readlines())
-        lines_to_process = file_lines[processed_line:]
-        for line in lines_to_process:
-            print line
-            if len(line.strip()) == 0:
-                print 'empty line'
-                continue
-            number, time_text = line.strip().split(',')
-            if number == '0':
-                print 'skipping 0 number'
-                continue
-            scan, created = ChipScan.objects.get_or_create(competition=url_data.competition, nr_text=number, time_text=time_text)
-            scan.time = time_text
-            try:
-                scan.nr = Number.objects.get(competition_id__in=url_data.competition.get_ids(), number=number, group='')
-            except:
-                print 'number not found'
-                continue
-            finally:
-                scan.save()
-
-            if not scan.is_processed:
-                if url_data.competition.processing_class:
-                    result = processing_class.process_chip_result(scan.id)
-
-        url_data.current_line = len(file_lines)
+        try:
+            # Compatibility with syncs that were stored only with line number.
+            skip_lines = url_data.current_line if not url_data.current_offset else 0
+            reader = ChipFileReader(resp, skip_bytes=url_data.current_offset - start_offset)
+            offset = url_data.current_offset
+            lines = []
+
+            for line in reader:
+                offset = start_offset + reader.bytes_consumed
+                if skip_lines:
+                    skip_lines -= 1
+                    continue
+                url_data.current_line += 1
+                lines.append(line)
+        finally:
+            resp.close()
+
+        if reader.is_truncated:
+            # Server doesn't support ranges and returned shorter file. Next run will process file from the beginning.
+            Log.objects.create(content_object=url_data, action="Chip file truncated", params={
+                'current_offset': url_data.current_offset,
+                'current_line': url_data.current_line,
+            })
+            url_data.reset_position()
+        else:
+            url_data.current_offset = offset
+            url_data.etag = resp.headers.get('etag', '')
+            url_data.last_modified = resp.headers.get('last-modified', '')
+
+            scan_ids = ingest_chip_lines(url_data.competition, lines)
+            if scan_ids and url_data.competition.processing_class:
+                processing_class.process_chip_results(scan_ids)
         url_data.save()
 
         processing_class.process_chip_recalculation()
@@ -144,4 +286,4 @@ def fetch_results(_id):
         Log.objects.create(content_object=url_data, action="Error processing file", params={
             'error': error,
         })
-        raise Exception('Error processing external chip file')
\ No newline at end of file
+        raise Exception('Error processing external chip file')
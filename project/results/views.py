@@ -7,11 +7,12 @@ from django.template.defaultfilters import slugify
 from django.views.generic import ListView, TemplateView, DetailView
 from django_tables2 import SingleTableView
 from core.models import Competition, Distance
+from results.helper import get_results_version, RESULTS_CACHE_TIMEOUT
 from results.models import Result, SebStandings, TeamResultStandings
 from results.tables import ResultTeamStandingTable
 from team.models import MemberApplication
 from velo.mixins.views import SetCompetitionContextMixin
-from velo.utils import load_class
+from core.processing import get_processing_class
 from django.db import connection
 from django.core.cache import cache
 
@@ -232,12 +233,7 @@ class TeamResultsByTeamName(SetCompetitionContextMixin, TemplateView):
 
         context = super(TeamResultsByTeamName, self).get_context_data(**kwargs)
 
-        cache_key = 'team_results_by_name_%i_%i' % (self.competition.id, self.distance.id)
-
-        default_timeout = 60*30
-        if self.competition.competition_date == datetime.date.today():
-            default_timeout = 60
-        print default_timeout
+        cache_key = 'team_results_by_name_%i_%i_%i' % (self.competition.id, self.distance.id, get_results_version(self.competition.id))
 
         object_list = cache.get(cache_key)
         if not object_list:
@@ -280,7 +276,7 @@ class TeamResultsByTeamName(SetCompetitionContextMixin, TemplateView):
     order by counter desc, total, team.team_name_slug, time
     """, [self.distance.id, self.distance.id])
             object_list = cursor.fetchall()
-            cache.set(cache_key, object_list, default_timeout)
+            cache.set(cache_key, object_list, RESULTS_CACHE_TIMEOUT)
 
         context.update({
             'object_list': object_list,
@@ -294,12 +290,10 @@ class ResultDiplomaPDF(DetailView):
 
     def get(self, *args, **kwargs):
         self.object = self.get_object()
-        if self.object.competition.processing_class:
-            _class = load_class(self.object.competition.processing_class)
-        else:
+        processing_class = get_processing_class(competition_id=self.object.competition_id)
+        if not processing_class:
             raise Http404
         try:
-            processing_class = _class(self.object.competition_id)
             file_obj = processing_class.generate_diploma(self.object)
         except:
             raise Http404
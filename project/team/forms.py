@@ -8,7 +8,8 @@ from crispy_forms.helper import FormHelper
 from django.utils import timezone
 from django.template.defaultfilters import slugify
 import datetime
-from core.models import Distance, CustomSlug
+from core.models import Distance
+from core.slugs import make_slug
 from team.models import Member, Team
 from velo.mixins.forms import RequestKwargModelFormMixin, GetClassNameMixin, CleanEmailMixin
 from django.utils.translation import ugettext_lazy as _
@@ -79,13 +80,7 @@ class MemberInlineForm(RequestKwargModelFormMixin, forms.ModelForm):
                 except:
                     pass
         else:
-            try:
-                slug = CustomSlug.objects.get(first_name=cleaned_data.get('first_name', ''),
-                                              last_name=cleaned_data.get('last_name', ''),
-                                              birthday=cleaned_data.get('birthday', '')).slug
-            except CustomSlug.DoesNotExist:
-                slug = slugify('%s-%s-%i' % (cleaned_data.get('first_name', ''), cleaned_data.get('last_name', ''),
-                                             cleaned_data.get('birthday', '').year))
+            slug = make_slug(cleaned_data.get('first_name', ''), cleaned_data.get('last_name', ''), cleaned_data.get('birthday', ''))
 
             try:
                 member = Member.objects.exclude(id=self.instance.id).filter(status=Member.STATUS_ACTIVE).get(
@@ -1,11 +1,13 @@
 # coding=utf-8
 from __future__ import unicode_literals
 from django.db import models
+from django.db.models import signals
 from django.template.defaultfilters import slugify
 import hmac
 import os
 import uuid
-from core.models import CustomSlug
+from core.slugs import make_slug
+from results.helper import bump_results_version
 from velo.mixins.models import StatusMixin, TimestampMixin
 from django_countries.fields import CountryField
 from django.utils.translation import ugettext_lazy as _
@@ -77,10 +79,7 @@ class Member(StatusMixin, models.Model):
         return '%s %s %s' % (self.first_name, self.last_name, self.birthday)
 
     def save(self, *args, **kwargs):
-        try:
-            self.slug = CustomSlug.objects.get(first_name=self.first_name, last_name=self.last_name, birthday=self.birthday).slug
-        except CustomSlug.DoesNotExist:
-            self.slug = slugify('%s-%s-%i' % (self.first_name, self.last_name, self.birthday.year))
+        self.slug = make_slug(self.first_name, self.last_name, self.birthday)
         return super(Member, self).save(*args, **kwargs)
 
 
@@ -99,4 +98,24 @@ class MemberApplication(models.Model):
     participant_unpaid = models.ForeignKey('registration.Participant', related_name='memberapplication_unpaid_set', blank=True, null=True)  # when participant applies, then team profile updates. And other way round.
     participant_potential = models.ForeignKey('registration.Participant', related_name='memberapplication_potential_set',blank=True, null=True)
 
-    legacy_id = models.IntegerField(blank=True, null=True)
\ No newline at end of file
+    legacy_id = models.IntegerField(blank=True, null=True)
+
+
+def team_results_changed(sender, instance, **kwargs):
+    """
+    Team pages of all stages are cached by results version, so versions are changed when team or its members change.
+    """
+    team = instance if isinstance(instance, Team) else instance.team
+    bump_results_version(team.distance.competition, include_children=True)
+
+signals.post_save.connect(team_results_changed, sender=Team)
+signals.post_delete.connect(team_results_changed, sender=Team)
+signals.post_save.connect(team_results_changed, sender=Member)
+signals.post_delete.connect(team_results_changed, sender=Member)
+
+
+def member_application_changed(sender, instance, **kwargs):
+    bump_results_version(instance.competition)
+
+signals.post_save.connect(member_application_changed, sender=MemberApplication)
+signals.post_delete.connect(member_application_changed, sender=MemberApplication)
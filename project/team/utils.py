@@ -2,7 +2,7 @@ from difflib import get_close_matches
 from core.models import Competition
 from registration.models import Participant
 from team.models import MemberApplication
-from velo.utils import load_class
+from core.processing import get_processing_class
 
 
 
@@ -17,8 +17,7 @@ def match_participant_to_applied(participant):
             participant.team = ma1.member.team
             participant.save()
             # Recalculate points
-            class_ = load_class(result.competition.processing_class)
-            _competition_class = class_(result.competition.id)
+            _competition_class = get_processing_class(competition_id=result.competition_id)
             _competition_class.recalculate_team_result(team=ma1.member.team)
 
 # TODO: Rebuild this
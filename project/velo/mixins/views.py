@@ -9,7 +9,8 @@ import datetime
 from advert.models import FlashBanner
 from core.models import Competition, Distance
 from django.core.cache import cache
-from velo.utils import load_class
+from results.helper import get_results_version
+from core.processing import get_processing_class
 from core.tasks import send_email_confirmation
 from django.utils.translation import ugettext_lazy as _
 
@@ -61,8 +62,7 @@ class SetCompetitionContextMixin(object):
 
     def get_competition_class(self):
         if not self.competition_class:
-            class_ = load_class(self.competition.processing_class)
-            self.competition_class = class_(competition=self.competition)
+            self.competition_class = get_processing_class(self.competition)
         return self.competition_class
 
 
@@ -136,6 +136,7 @@ class SetCompetitionContextMixin(object):
         context = super(SetCompetitionContextMixin, self).get_context_data(**kwargs)
         if self.competition:
             context.update({'competition': self.competition})
+            context.update({'results_version': get_results_version(self.competition.id)})
         if self.distances:
             context.update({'distances': self.distances})
         if self.distance:
@@ -180,6 +180,9 @@ AUTO_RENDER_SELECT2_STATICS = False
 SMS_USERNAME = os.environ['SMS_USERNAME']
 SMS_PASSWORD = os.environ['SMS_PASSWORD']
 SMS_GATEWAY = 'http://smsmarketing.bpo.lv'
+SMS_GATEWAY_RATE_LIMIT = 20  # messages per second, 0 - unlimited
+SMS_GATEWAY_CONCURRENCY = 4
+SMS_BATCH_SIZE = 100
 
 ADMIN_HONEYPOT_EMAIL_ADMINS = False
 
@@ -3,6 +3,7 @@ import os
 import requests
 import datetime
 import stat
+from django.db import connection
 
 
 def listdir(path):
@@ -29,6 +30,48 @@ def load_class(full_class_string):
     return getattr(module, class_str)
 
 
+BULK_UPDATE_BATCH_SIZE = 500
+SQLITE_MAX_VARIABLES = 999
+
+
+def bulk_update(objects, fields, batch_size=None):
+    """
+    Updates provided fields for list of model objects using one UPDATE query per batch.
+    Every object binds two parameters per field and its primary key, so on SQLite batch is limited to fit
+    in SQLite query variable limit.
+    """
+    objects = list(objects)
+    if not objects or not fields:
+        return 0
+
+    batch_size = batch_size or BULK_UPDATE_BATCH_SIZE
+    if connection.vendor == 'sqlite':
+        batch_size = min(batch_size, max(SQLITE_MAX_VARIABLES // (2 * len(fields) + 1), 1))
+
+    model = objects[0].__class__
+    opts = model._meta
+    qn = connection.ops.quote_name
+    pk_column = qn(opts.pk.column)
+    model_fields = [opts.get_field(name) for name in fields]
+
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start:start + batch_size]
+        assignments = []
+        params = []
+        for field in model_fields:
+            cases = []
+            for obj in batch:
+                cases.append('WHEN %s THEN %s')
+                params.extend([obj.pk, field.get_db_prep_save(getattr(obj, field.attname), connection=connection)])
+            assignments.append('%s = CAST(CASE %s %s END AS %s)' % (qn(field.column), pk_column, ' '.join(cases), field.db_type(connection)))
+        params.extend([obj.pk for obj in batch])
+        sql = 'UPDATE %s SET %s WHERE %s IN (%s)' % (qn(opts.db_table), ', '.join(assignments), pk_column, ', '.join(['%s'] * len(batch)))
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+
+    return len(objects)
+
+
 def bday_from_LV_SSN(ssn):
     try:
         ssn = ssn.replace('-', '').replace(' ', '').strip()